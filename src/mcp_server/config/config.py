@@ -1,3 +1,4 @@
+import functools
 import logging
 import os
 from typing import List
@@ -10,6 +11,10 @@ _CONFIG_ENV_KEY_ACCESS_KEY = "QINIU_ACCESS_KEY"
 _CONFIG_ENV_KEY_SECRET_KEY = "QINIU_SECRET_KEY"
 _CONFIG_ENV_LIVE_API_KEY = "QINIU_LIVE_API_KEY"
 _CONFIG_ENV_LIVE_ENDPOINT = "QINIU_LIVE_ENDPOINT"
+_CONFIG_ENV_LIVE_CONNECT_TIMEOUT = "QINIU_LIVE_CONNECT_TIMEOUT"
+_CONFIG_ENV_LIVE_READ_TIMEOUT = "QINIU_LIVE_READ_TIMEOUT"
+_CONFIG_ENV_LIVE_LIMIT_PER_HOST = "QINIU_LIVE_LIMIT_PER_HOST"
+_CONFIG_ENV_LIVE_CREATE_CACHE_TTL = "QINIU_LIVE_CREATE_CACHE_TTL"
 _CONFIG_ENV_KEY_ENDPOINT_URL = "QINIU_ENDPOINT_URL"
 _CONFIG_ENV_KEY_REGION_NAME = "QINIU_REGION_NAME"
 _CONFIG_ENV_KEY_BUCKETS = "QINIU_BUCKETS"
@@ -29,6 +34,15 @@ class Config:
     endpoint_url: str
     region_name: str
     buckets: List[str]
+    live_connect_timeout: float = 5.0
+    live_read_timeout: float = 30.0
+    live_limit_per_host: int = 32
+    live_create_cache_ttl: float = 0.0
+
+    @functools.cached_property
+    def live_endpoint_host(self) -> str:
+        """live_endpoint 去掉 http(s):// 前缀后的主机部分，首次访问时计算"""
+        return (self.live_endpoint or "").removeprefix("https://").removeprefix("http://")
 
 
 def load_config() -> Config:
@@ -40,6 +54,10 @@ def load_config() -> Config:
         endpoint_url=os.getenv(_CONFIG_ENV_KEY_ENDPOINT_URL),
         region_name=os.getenv(_CONFIG_ENV_KEY_REGION_NAME),
         buckets=_get_configured_buckets_from_env(),
+        live_connect_timeout=_get_float_from_env(_CONFIG_ENV_LIVE_CONNECT_TIMEOUT, 5.0),
+        live_read_timeout=_get_float_from_env(_CONFIG_ENV_LIVE_READ_TIMEOUT, 30.0),
+        live_limit_per_host=_get_int_from_env(_CONFIG_ENV_LIVE_LIMIT_PER_HOST, 32),
+        live_create_cache_ttl=_get_float_from_env(_CONFIG_ENV_LIVE_CREATE_CACHE_TTL, 0.0),
     )
 
     if not config.access_key or len(config.access_key) == 0:
@@ -69,3 +87,26 @@ def _get_configured_buckets_from_env() -> List[str]:
         return buckets
     else:
         return []
+
+
+def _get_float_from_env(key: str, default: float) -> float:
+    value = os.getenv(key)
+    if not value:
+        return default
+    try:
+        return float(value)
+    except ValueError:
+        logger.warning(f"Invalid value for {key}: {value}, using default {default}")
+        return default
+
+
+
+def _get_int_from_env(key: str, default: int) -> int:
+    value = os.getenv(key)
+    if not value:
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        logger.warning(f"Invalid value for {key}: {value}, using default {default}")
+        return default
@@ -1,3 +1,5 @@
+import asyncio
+
 from ..config import config
 from .storage import load as load_storage
 from .media_processing import load as load_media_processing
@@ -5,6 +7,18 @@ from .cdn import load as load_cdn
 from .version import load as load_version
 from .live_streaming import load as load_live_streaming
 
+# 持有网络连接、需要在退出时关闭的服务；按业务保存，重复加载时覆盖而不是累加
+_closeable_services = {}
+# 重复加载时被替换的服务；其连接属于运行中的事件循环，由 close() 在该循环中关闭
+_replaced_services = []
+
+
+def _track(business: str, service):
+    previous = _closeable_services.get(business)
+    if previous is not None and previous is not service:
+        _replaced_services.append(previous)
+    _closeable_services[business] = service
+
 
 def load():
     # 加载配置
@@ -13,11 +27,24 @@ def load():
     # 版本
     load_version(cfg)
     # 存储业务
-    load_storage(cfg)
+    _track("storage", load_storage(cfg))
     # CDN
     load_cdn(cfg)
     # 智能多媒体
     load_media_processing(cfg)
     # Miku
-    load_live_streaming(cfg)
+    _track("live_streaming", load_live_streaming(cfg))
+
+
+async def preconnect():
+    """预先建立各服务的网络连接，失败不影响启动"""
+    await asyncio.gather(*(service.preconnect() for service in _closeable_services.values()), return_exceptions=True)
+
+
+async def close():
+    """关闭各服务持有的网络连接，包括重复加载时被替换的服务"""
+    while _replaced_services:
+        await _replaced_services.pop().close()
+    for service in _closeable_services.values():
+        await service.close()
 
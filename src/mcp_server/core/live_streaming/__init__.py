@@ -4,8 +4,7 @@ from ...config import config
 
 
 def load(cfg: config.Config):
-    live = LiveStreamingService(cfg)
-    register_tools(live)
+    return register_tools(LiveStreamingService(cfg))
 
 
 __all__ = ["load"]
@@ -1,80 +1,349 @@
+import asyncio
+import functools
+import inspect
 import aiohttp
+import aiohttp.abc
+import yarl
 import logging
 import json
+import ssl
 import base64
 import hmac
 import hashlib
 
+from ...cache import cache
 from ...config import config
 from ...consts import consts
-from urllib.parse import urlparse
-from typing import Dict, Any, Optional
+from urllib.parse import quote
+from typing import Callable, Dict, Any, List, Optional, Tuple, Union
 
 logger = logging.getLogger(consts.LOGGER_NAME)
 
+# Listing responses compress well; aiohttp decompresses them transparently
+# (ClientSession defaults to auto_decompress=True).
+_LIST_HEADERS = {"Accept-Encoding": "gzip, deflate"}
+
+_JSON_CONTENT_TYPE = "application/json"
+_JSON_HEADERS = {"Content-Type": _JSON_CONTENT_TYPE}
+
+_DEFAULT_LIVE_ENDPOINT = "mls.cn-east-1.qiniumiku.com"
+
+_EMPTY_JSON_BODY = b"{}"
+
+# One verified TLS context (CA store parsed once) shared by every connection.
+# Only http/1.1 is offered: aiohttp cannot speak h2, so advertising it via ALPN would break.
+_SSL_CONTEXT = ssl.create_default_context()
+_SSL_CONTEXT.set_alpn_protocols(["http/1.1"])
+
+# Error bodies are only echoed back in messages; never buffer more than this
+_MAX_ERROR_BODY = 4096
+
+# Status codes that mean a create/bind request took effect
+_SUCCESS_CODES = frozenset({200, 201, 204})
+
+# Seconds a successful traffic stats / bucket list response is reused
+_STATS_CACHE_TTL = 30
+_BUCKETS_CACHE_TTL = 5
+
+# Methods that need a larger read budget than the configured default,
+# expressed as a multiplier of live_read_timeout.
+_READ_TIMEOUT_FACTORS = {
+    "query_live_traffic_stats": 2,
+}
+
+
+def _ok(message: str, status_code: Optional[int] = None, **fields) -> Dict[str, Any]:
+    """Build a success result: status, caller fields, message, status_code"""
+    result = {"status": "success", **fields, "message": message}
+    if status_code is not None:
+        result["status_code"] = status_code
+    return result
+
+
+def _err(message: str, status_code: Optional[int] = None, **fields) -> Dict[str, Any]:
+    """Build an error result: status, caller fields, message, status_code"""
+    result = {"status": "error", **fields, "message": message}
+    if status_code is not None:
+        result["status_code"] = status_code
+    return result
+
+
+def _make_resolver() -> aiohttp.abc.AbstractResolver:
+    """
+    Resolve through c-ares (aiodns) when it is installed, otherwise through
+    getaddrinfo on the default executor. Either way the connector caches the
+    answers for ttl_dns_cache seconds.
+    """
+    try:
+        import aiodns  # noqa: F401
+    except ImportError:
+        return aiohttp.ThreadedResolver()
+    return aiohttp.AsyncResolver()
+
+
+@functools.lru_cache(maxsize=1024)
+def _push_urls(push_domain: str, bucket: str, stream_name: str) -> Tuple[str, str]:
+    """RTMP and WHIP push URLs of a stream; cached since tools are often re-run on the same stream"""
+    location = f"{push_domain}/{bucket}/{stream_name}"
+    return "rtmp://" + location, f"https://{location}.whip"
+
+
+@functools.lru_cache(maxsize=1024)
+def _play_urls(play_domain: str, bucket: str, stream_name: str) -> Tuple[str, str, str]:
+    """FLV, M3U8 and WHEP playback URLs of a stream, all sharing one https prefix"""
+    base_url = f"https://{play_domain}/{bucket}/{stream_name}"
+    return base_url + ".flv", base_url + ".m3u8", base_url + ".whep"
+
+
+def _single_flight(func):
+    """
+    Let concurrent calls with the same arguments share one in-flight request.
+
+    The request runs as its own task, so a caller being cancelled does not
+    cancel it for the others still waiting on the result.
+    """
+    signature = inspect.signature(func)
+
+    @functools.wraps(func)
+    async def wrapper(self, *args, **kwargs):
+        bound = signature.bind(self, *args, **kwargs)
+        bound.apply_defaults()
+        key = (func.__name__, *list(bound.arguments.values())[1:])
+
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(func(self, *args, **kwargs))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(task)
+
+    return wrapper
+
+
+def _timeout_as_error(func):
+    """Report a request that ran past its timeout as an error result instead of raising"""
+    @functools.wraps(func)
+    async def wrapper(self, *args, **kwargs):
+        try:
+            return await func(self, *args, **kwargs)
+        except asyncio.TimeoutError:
+            logger.error("Live streaming request timed out: %s", func.__name__)
+            return _err(f"Request timed out: {func.__name__}")
+
+    return wrapper
+
+
+def _encode_json(data: Dict[str, Any]) -> bytes:
+    """Serialize a request body once, as the exact bytes that get signed and sent"""
+    return json.dumps(data, separators=(",", ":")).encode("utf-8")
+
+
+async def _read_json(response: aiohttp.ClientResponse) -> Any:
+    """
+    Parse a response body as JSON directly from its bytes.
+
+    Falls back to the decoded text when the body is not valid JSON, which is
+    what the list endpoints used to return unconditionally.
+    """
+    raw = await response.read()
+    try:
+        return json.loads(raw)
+    except ValueError:
+        return raw.decode("utf-8", errors="replace")
+
+
+async def _read_error_text(response: aiohttp.ClientResponse) -> str:
+    """Read at most _MAX_ERROR_BODY bytes of an error response as text"""
+    body = bytearray()
+    while len(body) < _MAX_ERROR_BODY:
+        chunk = await response.content.read(_MAX_ERROR_BODY - len(body))
+        if not chunk:
+            break
+        body += chunk
+    return body.decode("utf-8", errors="replace")
+
+
+def _split_url(url: str) -> Tuple[str, str, str]:
+    """
+    Split a ``scheme://host/path?query`` URL into (host, path, query).
+
+    Only handles the absolute URLs this service builds itself, which is all
+    the signer needs; much cheaper than urlparse on every signed request.
+    """
+    host_start = url.index("://") + 3
+    path_start = url.find("/", host_start)
+    if path_start == -1:
+        return url[host_start:], "/", ""
+    query_start = url.find("?", path_start)
+    if query_start == -1:
+        return url[host_start:path_start], url[path_start:], ""
+    return url[host_start:path_start], url[path_start:query_start], url[query_start + 1:]
+
+
+def _make_signer(secret: bytes, token_prefix: str) -> Callable[[bytes], str]:
+    """
+    Build the Qiniu token function for one secret key.
+
+    The HMAC state is keyed once (ipad/opad already absorbed) and every call
+    copies it; it and the helpers are bound as closure locals so a signature
+    costs no attribute or global lookups.
+    """
+    keyed = hmac.new(secret, digestmod=hashlib.sha1)
+
+    def sign(data: bytes, _copy=keyed.copy, _b64=base64.urlsafe_b64encode, _prefix=token_prefix) -> str:
+        mac = _copy()
+        mac.update(data)
+        return _prefix + _b64(mac.digest()).decode('ascii')
+
+    return sign
+
 
 class LiveStreamingService:
     def __init__(self, cfg: config.Config = None):
         self.config = cfg
         self.live_api_key = cfg.live_api_key if cfg else None
-        self.live_endpoint = cfg.live_endpoint if cfg else "mls.cn-east-1.qiniumiku.com"
+        self.live_endpoint = (cfg.live_endpoint if cfg else None) or _DEFAULT_LIVE_ENDPOINT
+        # live_endpoint without scheme, parsed once by the config for all URL builders
+        self._endpoint = (cfg.live_endpoint_host if cfg else None) or _DEFAULT_LIVE_ENDPOINT
+        self._api_url = f"https://{self._endpoint}/"
+        self._stats_url = f"http://{self._endpoint}/"
         self.access_key = cfg.access_key if cfg else None
         self.secret_key = cfg.secret_key if cfg else None
+        self._secret_bytes = self.secret_key.encode('utf-8') if self.secret_key else None
+        # Auth mode is fixed by config, decide it once instead of per request
+        self._use_api_key = bool(self.live_api_key and self.live_api_key != "YOUR_QINIU_LIVE_API_KEY")
+        self._use_qiniu_auth = bool(
+            self.access_key and self.secret_key
+            and self.access_key != "YOUR_QINIU_ACCESS_KEY"
+            and self.secret_key != "YOUR_QINIU_SECRET_KEY"
+        )
+        # Constant auth headers; callers only merge them, so they are shared, not copied
+        self._api_key_headers = {"Authorization": "Bearer " + self.live_api_key} if self._use_api_key else None
+        self._api_key_json_headers = {**self._api_key_headers, **_JSON_HEADERS} if self._use_api_key else None
+        self._api_key_list_headers = {**self._api_key_headers, **_LIST_HEADERS} if self._use_api_key else None
+        self._auth_prefix = "Qiniu "
+        self._sign = _make_signer(self._secret_bytes, f"{self.access_key}:") if self.access_key and self._secret_bytes else None
+
+        connect_timeout = cfg.live_connect_timeout if cfg else 5.0
+        read_timeout = cfg.live_read_timeout if cfg else 30.0
+        # sock_read bounds each stalled read; total caps a slowly trickling response too
+        self._timeout = aiohttp.ClientTimeout(
+            total=connect_timeout + read_timeout,
+            connect=connect_timeout,
+            sock_connect=connect_timeout,
+            sock_read=read_timeout,
+        )
+        self._timeouts = {
+            name: aiohttp.ClientTimeout(
+                total=connect_timeout + read_timeout * factor,
+                connect=connect_timeout,
+                sock_connect=connect_timeout,
+                sock_read=read_timeout * factor,
+            )
+            for name, factor in _READ_TIMEOUT_FACTORS.items()
+        }
+        self._limit_per_host = cfg.live_limit_per_host if cfg else 32
+        self._session: Optional[aiohttp.ClientSession] = None
+        # create_* requests currently in flight, keyed by method name and arguments
+        self._inflight: Dict[Tuple, asyncio.Future] = {}
+        # Short-lived caches for idempotent reads that clients tend to repeat
+        self._stats_cache = cache.TTLCache(ttl=_STATS_CACHE_TTL)
+        self._buckets_cache = cache.TTLCache(ttl=_BUCKETS_CACHE_TTL, maxsize=1)
+        # Successful creates, replayed instead of re-sending the idempotent PUT; off when the TTL is 0
+        created_cache_ttl = cfg.live_create_cache_ttl if cfg else 0
+        self._created_cache = cache.TTLCache(ttl=created_cache_ttl, maxsize=1024) if created_cache_ttl > 0 else None
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Return the shared HTTP session, creating it on first use"""
+        if self._session is None or self._session.closed:
+            # The session owns the connector and closes it with itself, so the
+            # connector (pooled sockets, DNS cache) lives exactly as long as the session.
+            connector = aiohttp.TCPConnector(
+                limit=64,
+                limit_per_host=self._limit_per_host,
+                keepalive_timeout=75,
+                use_dns_cache=True,
+                ttl_dns_cache=600,
+                resolver=_make_resolver(),
+                happy_eyeballs_delay=0.25,
+                ssl=_SSL_CONTEXT,
+            )
+            self._session = aiohttp.ClientSession(connector=connector, timeout=self._timeout)
+        return self._session
+
+    async def preconnect(self):
+        """
+        Resolve the API host and open a pooled keep-alive connection to it, so
+        the first tool call does not pay for DNS + TCP + TLS. Failures are only
+        logged; the next real request simply connects as usual.
+        """
+        session = await self._get_session()
+        try:
+            async with session.head(self._api_url, allow_redirects=False) as response:
+                logger.debug("Preconnected to %s, status: %s", self._endpoint, response.status)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.debug("Preconnect to %s failed: %s", self._endpoint, e)
 
+    async def close(self):
+        """Close the shared HTTP session and release pooled connections"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
 
-    def _get_auth_header(self, method: str, url: str, content_type: Optional[str] = None, body: Optional[str] = None) -> Dict[str, str]:
+    def _get_auth_header(self, method: str, url: str, content_type: Optional[str] = None, body: Optional[Union[str, bytes]] = None) -> Dict[str, str]:
 
         # Priority 1: Fall back to API KEY if ACCESS_KEY/SECRET_KEY not configured
-        if self.live_api_key and self.live_api_key != "YOUR_QINIU_LIVE_API_KEY":
-            return {
-                "Authorization": f"Bearer {self.live_api_key}"
-            }
+        if self._use_api_key:
+            return self._api_key_headers
 
         # Priority 2: Use QINIU_ACCESS_KEY/QINIU_SECRET_KEY if configured
-        if self.access_key and self.secret_key and \
-                self.access_key != "YOUR_QINIU_ACCESS_KEY" and \
-                self.secret_key != "YOUR_QINIU_SECRET_KEY":
+        if self._use_qiniu_auth:
             # Generate Qiniu token for the request
             # For live streaming API, we use a simple token format
             token = self._generate_qiniu_token(method, url, content_type, body)
-            # token = generate_signature(method, url, body,self.access_key, self.secret_key)
-            return {
-                "Authorization": f"Qiniu {token}"
-            }
+            return {"Authorization": self._auth_prefix + token}
         return  {
             "Authorization": "Qiniu ak:sk"
         }
 
+    def _get_auth_header_for_get(self, url: str) -> Dict[str, str]:
+        """Auth header for a body-less GET, skipping the content-type/body handling"""
+        if self._use_api_key:
+            return self._api_key_headers
+        if self._use_qiniu_auth:
+            return {"Authorization": self._auth_prefix + self._sign_get(url)}
+        return {"Authorization": "Qiniu ak:sk"}
+
+    def _get_json_headers(self, method: str, url: str, body: bytes) -> Dict[str, str]:
+        """Full header set for a request carrying a JSON body"""
+        if self._use_api_key:
+            return self._api_key_json_headers
+        return {**self._get_auth_header(method, url, _JSON_CONTENT_TYPE, body), **_JSON_HEADERS}
+
+    def _get_list_headers(self, url: str) -> Dict[str, str]:
+        """Full header set for the (compressible) list GETs"""
+        if self._use_api_key:
+            return self._api_key_list_headers
+        return {**self._get_auth_header_for_get(url), **_LIST_HEADERS}
+
+    def _sign_get(self, url: str) -> str:
+        """Qiniu token for a GET request: no Content-Type line and no body"""
+        host, path, query = _split_url(url)
+        data = f"GET {path}?{query}\nHost: {host}\n\n" if query else f"GET {path}\nHost: {host}\n\n"
+        return self._sign(data.encode('utf-8'))
+
     def _build_bucket_url(self, bucket: str) -> str:
         """Build S3-style bucket URL"""
-        if not self.live_endpoint:
-            self.live_endpoint = "mls.cn-east-1.qiniumiku.com"
-
-        # Remove protocol if present in live_endpoint
-        endpoint = self.live_endpoint
-        if endpoint.startswith("http://"):
-            endpoint = endpoint[7:]
-        elif endpoint.startswith("https://"):
-            endpoint = endpoint[8:]
-
         # Build URL in format: https://<bucket>.<endpoint>
-        return f"https://{bucket}.{endpoint}"
+        return f"https://{bucket}.{self._endpoint}"
 
     def _build_stream_url(self, bucket: str, stream: str) -> str:
         """Build S3-style stream URL"""
-        if not self.live_endpoint:
-            self.live_endpoint = "mls.cn-east-1.qiniumiku.com"
-
-        # Remove protocol if present in live_endpoint
-        endpoint = self.live_endpoint
-        if endpoint.startswith("http://"):
-            endpoint = endpoint[7:]
-        elif endpoint.startswith("https://"):
-            endpoint = endpoint[8:]
-
         # Build URL in format: https://<bucket>.<endpoint>/<stream>
-        return f"https://{bucket}.{endpoint}/{stream}"
+        return f"https://{bucket}.{self._endpoint}/{stream}"
 
+    @_timeout_as_error
+    @_single_flight
     async def create_bucket(self, bucket: str) -> Dict[str, Any]:
         """
         Create a bucket using S3-style API
@@ -85,55 +354,35 @@ class LiveStreamingService:
         Returns:
             Dict containing the response status and message
         """
-        url = self._build_bucket_url(bucket)
-        data = {}
-        bodyJson = json.dumps(data)
-        auth_headers = self._get_auth_header(method="PUT", url=url, content_type="application/json", body=bodyJson)
-        headers = {"Content-Type": "application/json"}
-        # 如果有认证头，添加到headers中
-        if auth_headers:
-            headers.update(auth_headers)
-
-        # 打印 HTTP 请求信息
-        print("=== HTTP 请求信息 ===")
-        print("方法: PUT")
-        print(f"URL: {url}")
-        print("请求头:")
-        for key, value in headers.items():
-            print(f"  {key}: {value}")
-        print("请求体: {}")
-        print("===================")
-
-        print(f"Creating bucket: {bucket} at {url}")
-
-        async with aiohttp.ClientSession() as session:
-            async with session.put(url, headers=headers, data=bodyJson) as response:
-                status = response.status
-                text = await response.text()
-
-                print(f"状态码: {status}")
-                print(f"响应内容: {text}")
-                print("==================")
-
-                if status == 200 or status == 201:
-                    logger.info(f"Successfully created bucket: {bucket}")
-                    return {
-                        "status": "success",
-                        "bucket": bucket,
-                        "url": url,
-                        "message": f"Bucket '{bucket}' created successfully",
-                        "status_code": status
-                    }
-                else:
-                    logger.error(f"Failed to create bucket: {bucket}, status: {status}, response: {text}")
-                    return {
-                        "status": "error",
-                        "bucket": bucket,
-                        "url": url,
-                        "message": f"Failed to create bucket: {text}",
-                        "status_code": status
-                    }
+        if self._created_cache is not None and (cached := self._created_cache.get(("bucket", bucket))):
+            return cached
 
+        url = self._build_bucket_url(bucket)
+        bodyJson = _EMPTY_JSON_BODY
+        headers = self._get_json_headers("PUT", url, bodyJson)
+
+        logger.debug("Creating bucket: %s at %s", bucket, url)
+
+        session = await self._get_session()
+        async with session.put(url, headers=headers, data=bodyJson) as response:
+            status = response.status
+
+            if status in _SUCCESS_CODES:
+                # Drain the (tiny, unused) body without decoding so the connection returns to the pool
+                await response.read()
+                logger.info("Successfully created bucket: %s", bucket)
+                self._buckets_cache.clear()
+                result = _ok(f"Bucket '{bucket}' created successfully", status_code=status, bucket=bucket, url=url)
+                if self._created_cache is not None:
+                    self._created_cache.set(("bucket", bucket), result)
+                return result
+            else:
+                text = await _read_error_text(response)
+                logger.error("Failed to create bucket: %s, status: %s, response: %s", bucket, status, text)
+                return _err(f"Failed to create bucket: {text}", status_code=status, bucket=bucket, url=url)
+
+    @_timeout_as_error
+    @_single_flight
     async def create_stream(self, bucket: str, stream: str) -> Dict[str, Any]:
         """
         Create a stream using S3-style API
@@ -145,42 +394,44 @@ class LiveStreamingService:
         Returns:
             Dict containing the response status and message
         """
-        url = self._build_stream_url(bucket, stream)
-        data = {}
-        bodyJson = json.dumps(data)
-        headers = {
-            **self._get_auth_header(method="PUT", url=url, content_type="application/json", body=bodyJson),
-            "Content-Type": "application/json"
-        }
-
-        logger.info(f"Creating stream: {stream} in bucket: {bucket} at {url}")
-
-        async with aiohttp.ClientSession() as session:
-            async with session.put(url, headers=headers, data=bodyJson) as response:
-                status = response.status
-                text = await response.text()
-
-                if status == 200 or status == 201:
-                    logger.info(f"Successfully created stream: {stream} in bucket: {bucket}")
-                    return {
-                        "status": "success",
-                        "bucket": bucket,
-                        "stream": stream,
-                        "url": url,
-                        "message": f"Stream '{stream}' created successfully in bucket '{bucket}'",
-                        "status_code": status
-                    }
-                else:
-                    logger.error(f"Failed to create stream: {stream}, status: {status}, response: {text}")
-                    return {
-                        "status": "error",
-                        "bucket": bucket,
-                        "stream": stream,
-                        "url": url,
-                        "message": f"Failed to create stream: {text}",
-                        "status_code": status
-                    }
+        if self._created_cache is not None and (cached := self._created_cache.get(("stream", bucket, stream))):
+            return cached
 
+        url = self._build_stream_url(bucket, stream)
+        bodyJson = _EMPTY_JSON_BODY
+        headers = self._get_json_headers("PUT", url, bodyJson)
+
+        logger.debug("Creating stream: %s in bucket: %s at %s", stream, bucket, url)
+
+        session = await self._get_session()
+        async with session.put(url, headers=headers, data=bodyJson) as response:
+            status = response.status
+
+            if status in _SUCCESS_CODES:
+                await response.read()
+                logger.info("Successfully created stream: %s in bucket: %s", stream, bucket)
+                result = _ok(
+                    f"Stream '{stream}' created successfully in bucket '{bucket}'",
+                    status_code=status,
+                    bucket=bucket,
+                    stream=stream,
+                    url=url,
+                )
+                if self._created_cache is not None:
+                    self._created_cache.set(("stream", bucket, stream), result)
+                return result
+            else:
+                text = await _read_error_text(response)
+                logger.error("Failed to create stream: %s, status: %s, response: %s", stream, status, text)
+                return _err(
+                    f"Failed to create stream: {text}",
+                    status_code=status,
+                    bucket=bucket,
+                    stream=stream,
+                    url=url,
+                )
+
+    @_timeout_as_error
     async def bind_push_domain(self, bucket: str, domain: str, domain_type: str = "pushRtmp") -> Dict[str, Any]:
         """
         Bind a push domain to the bucket
@@ -198,40 +449,37 @@ class LiveStreamingService:
             "domain": domain,
             "type": domain_type
         }
-        body_str = json.dumps(data)
-        headers = {
-            **self._get_auth_header(method="POST", url=url, content_type="application/json", body=body_str),
-            "Content-Type": "application/json"
-        }
-
-        logger.info(f"Binding push domain: {domain} (type: {domain_type}) to bucket: {bucket}")
-
-        async with aiohttp.ClientSession() as session:
-            async with session.post(url, headers=headers, json=data) as response:
-                status = response.status
-                text = await response.text()
-
-                if status == 200 or status == 201:
-                    logger.info(f"Successfully bound push domain: {domain} to bucket: {bucket}")
-                    return {
-                        "status": "success",
-                        "bucket": bucket,
-                        "domain": domain,
-                        "type": domain_type,
-                        "message": f"Push domain '{domain}' bound successfully to bucket '{bucket}'",
-                        "status_code": status
-                    }
-                else:
-                    logger.error(f"Failed to bind push domain: {domain}, status: {status}, response: {text}")
-                    return {
-                        "status": "error",
-                        "bucket": bucket,
-                        "domain": domain,
-                        "type": domain_type,
-                        "message": f"Failed to bind push domain: {text}",
-                        "status_code": status
-                    }
-
+        body = _encode_json(data)
+        headers = self._get_json_headers("POST", url, body)
+
+        logger.debug("Binding push domain: %s (type: %s) to bucket: %s", domain, domain_type, bucket)
+
+        session = await self._get_session()
+        async with session.post(url, headers=headers, data=body) as response:
+            status = response.status
+
+            if status in _SUCCESS_CODES:
+                await response.read()
+                logger.info("Successfully bound push domain: %s to bucket: %s", domain, bucket)
+                return _ok(
+                    f"Push domain '{domain}' bound successfully to bucket '{bucket}'",
+                    status_code=status,
+                    bucket=bucket,
+                    domain=domain,
+                    type=domain_type,
+                )
+            else:
+                text = await _read_error_text(response)
+                logger.error("Failed to bind push domain: %s, status: %s, response: %s", domain, status, text)
+                return _err(
+                    f"Failed to bind push domain: {text}",
+                    status_code=status,
+                    bucket=bucket,
+                    domain=domain,
+                    type=domain_type,
+                )
+
+    @_timeout_as_error
     async def bind_play_domain(self, bucket: str, domain: str, domain_type: str = "live") -> Dict[str, Any]:
         """
         Bind a playback domain to the bucket
@@ -249,38 +497,112 @@ class LiveStreamingService:
             "domain": domain,
             "type": domain_type
         }
-        body_str = json.dumps(data)
-        headers = {
-            **self._get_auth_header(method="POST", url=url, content_type="application/json", body=body_str),
-            "Content-Type": "application/json"
+        body = _encode_json(data)
+        headers = self._get_json_headers("POST", url, body)
+        logger.debug("Binding playback domain: %s (type: %s) to bucket: %s", domain, domain_type, bucket)
+
+        session = await self._get_session()
+        async with session.post(url, headers=headers, data=body) as response:
+            status = response.status
+
+            if status in _SUCCESS_CODES:
+                await response.read()
+                logger.info("Successfully bound playback domain: %s to bucket: %s", domain, bucket)
+                return _ok(
+                    f"Playback domain '{domain}' bound successfully to bucket '{bucket}'",
+                    status_code=status,
+                    bucket=bucket,
+                    domain=domain,
+                    type=domain_type,
+                )
+            else:
+                text = await _read_error_text(response)
+                logger.error("Failed to bind playback domain: %s, status: %s, response: %s", domain, status, text)
+                return _err(
+                    f"Failed to bind playback domain: {text}",
+                    status_code=status,
+                    bucket=bucket,
+                    domain=domain,
+                    type=domain_type,
+                )
+
+    async def bind_domains(
+            self,
+            bucket: str,
+            push_domain: str,
+            play_domain: str,
+            push_domain_type: str = "pushRtmp",
+            play_domain_type: str = "live",
+    ) -> Dict[str, Any]:
+        """
+        Bind a push domain and a playback domain to a bucket concurrently
+
+        Args:
+            bucket: The bucket name
+            push_domain: The push domain to bind
+            play_domain: The playback domain to bind
+            push_domain_type: The type of push domain (default: pushRtmp)
+            play_domain_type: The type of playback domain (default: live)
+
+        Returns:
+            Dict containing the result of both bindings
+        """
+        push_result, play_result = await asyncio.gather(
+            self.bind_push_domain(bucket, push_domain, push_domain_type),
+            self.bind_play_domain(bucket, play_domain, play_domain_type),
+        )
+        if push_result["status"] == "success" and play_result["status"] == "success":
+            return _ok(
+                f"Domains bound successfully to bucket '{bucket}'",
+                push_domain=push_result,
+                play_domain=play_result,
+            )
+        return _err(f"Failed to bind domains to bucket '{bucket}'", push_domain=push_result, play_domain=play_result)
+
+    async def provision(
+            self,
+            bucket: str,
+            stream: str,
+            push_domain: str,
+            play_domain: str,
+            push_domain_type: str = "pushRtmp",
+            play_domain_type: str = "live",
+    ) -> Dict[str, Any]:
+        """
+        Create a bucket, then create a stream and bind push/playback domains to it
+
+        The bucket has to exist first; the remaining three calls only depend on
+        the bucket and are sent concurrently.
+
+        Args:
+            bucket: The bucket name to create
+            stream: The stream name to create in the bucket
+            push_domain: The push domain to bind
+            play_domain: The playback domain to bind
+            push_domain_type: The type of push domain (default: pushRtmp)
+            play_domain_type: The type of playback domain (default: live)
+
+        Returns:
+            Dict containing the result of every step
+        """
+        bucket_result = await self.create_bucket(bucket)
+        if bucket_result["status"] != "success":
+            return _err(f"Failed to provision bucket '{bucket}'", bucket=bucket_result)
+
+        stream_result, push_result, play_result = await asyncio.gather(
+            self.create_stream(bucket, stream),
+            self.bind_push_domain(bucket, push_domain, push_domain_type),
+            self.bind_play_domain(bucket, play_domain, play_domain_type),
+        )
+        steps = {
+            "bucket": bucket_result,
+            "stream": stream_result,
+            "push_domain": push_result,
+            "play_domain": play_result,
         }
-        logger.info(f"Binding playback domain: {domain} (type: {domain_type}) to bucket: {bucket}")
-
-        async with aiohttp.ClientSession() as session:
-            async with session.post(url, headers=headers, json=data) as response:
-                status = response.status
-                text = await response.text()
-
-                if status == 200 or status == 201:
-                    logger.info(f"Successfully bound playback domain: {domain} to bucket: {bucket}")
-                    return {
-                        "status": "success",
-                        "bucket": bucket,
-                        "domain": domain,
-                        "type": domain_type,
-                        "message": f"Playback domain '{domain}' bound successfully to bucket '{bucket}'",
-                        "status_code": status
-                    }
-                else:
-                    logger.error(f"Failed to bind playback domain: {domain}, status: {status}, response: {text}")
-                    return {
-                        "status": "error",
-                        "bucket": bucket,
-                        "domain": domain,
-                        "type": domain_type,
-                        "message": f"Failed to bind playback domain: {text}",
-                        "status_code": status
-                    }
+        if all(step["status"] == "success" for step in steps.values()):
+            return _ok(f"Bucket '{bucket}' provisioned successfully", **steps)
+        return _err(f"Failed to provision bucket '{bucket}'", **steps)
 
     def get_push_urls(self, push_domain: str, bucket: str, stream_name: str) -> Dict[str, Any]:
         """
@@ -294,19 +616,17 @@ class LiveStreamingService:
         Returns:
             Dict containing RTMP and WHIP push URLs
         """
-        rtmp_url = f"rtmp://{push_domain}/{bucket}/{stream_name}"
-        whip_url = f"https://{push_domain}/{bucket}/{stream_name}.whip"
-
-        logger.info(f"Generated push URLs for stream: {stream_name}")
-        return {
-            "status": "success",
-            "push_domain": push_domain,
-            "bucket": bucket,
-            "stream_name": stream_name,
-            "rtmp_url": rtmp_url,
-            "whip_url": whip_url,
-            "message": "Push URLs generated successfully"
-        }
+        rtmp_url, whip_url = _push_urls(push_domain, bucket, stream_name)
+
+        logger.debug("Generated push URLs for stream: %s", stream_name)
+        return _ok(
+            "Push URLs generated successfully",
+            push_domain=push_domain,
+            bucket=bucket,
+            stream_name=stream_name,
+            rtmp_url=rtmp_url,
+            whip_url=whip_url,
+        )
 
     def get_play_urls(self, play_domain: str, bucket: str, stream_name: str) -> Dict[str, Any]:
         """
@@ -320,22 +640,21 @@ class LiveStreamingService:
         Returns:
             Dict containing FLV, M3U8, and WHEP playback URLs
         """
-        flv_url = f"https://{play_domain}/{bucket}/{stream_name}.flv"
-        m3u8_url = f"https://{play_domain}/{bucket}/{stream_name}.m3u8"
-        whep_url = f"https://{play_domain}/{bucket}/{stream_name}.whep"
-
-        logger.info(f"Generated playback URLs for stream: {stream_name}")
-        return {
-            "status": "success",
-            "play_domain": play_domain,
-            "bucket": bucket,
-            "stream_name": stream_name,
-            "flv_url": flv_url,
-            "m3u8_url": m3u8_url,
-            "whep_url": whep_url,
-            "message": "Playback URLs generated successfully"
-        }
-
+        flv_url, m3u8_url, whep_url = _play_urls(play_domain, bucket, stream_name)
+
+        logger.debug("Generated playback URLs for stream: %s", stream_name)
+        return _ok(
+            "Playback URLs generated successfully",
+            play_domain=play_domain,
+            bucket=bucket,
+            stream_name=stream_name,
+            flv_url=flv_url,
+            m3u8_url=m3u8_url,
+            whep_url=whep_url,
+        )
+
+    @_timeout_as_error
+    @_single_flight
     async def query_live_traffic_stats(self, begin: str, end: str, include_raw_data: bool = False) -> Dict[str, Any]:
         """
         Query live streaming traffic statistics
@@ -349,137 +668,123 @@ class LiveStreamingService:
             Dict containing traffic statistics with total traffic (bytes), average bandwidth (bps),
             peak bandwidth (bps), and optionally raw data
         """
-        if not self.live_endpoint:
-            self.live_endpoint = "mls.cn-east-1.qiniumiku.com"
-
-        # Remove protocol and bucket prefix to get base endpoint
-        endpoint = self.live_endpoint
-        if endpoint.startswith("http://"):
-            endpoint = endpoint[7:]
-        elif endpoint.startswith("https://"):
-            endpoint = endpoint[8:]
-
-        # Remove bucket prefix if present (format: bucket.endpoint)
-       # if '.' in endpoint:
-       #     parts = endpoint.split('.', 1)
-       #     if len(parts) > 1:
-       #         endpoint = parts[1]
-
-        url = f"http://{endpoint}/?trafficStats&begin={begin}&end={end}&g=5min&select=flow&flow=downflow"
-        headers = self._get_auth_header(method="GET", url=url)
-
-        logger.info(f"Querying live traffic stats from {begin} to {end}")
-
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, headers=headers) as response:
-                status = response.status
-                text = await response.text()
-
-                if status == 200:
-                    logger.info("Successfully queried live traffic stats")
-
-                    try:
-                        # Parse JSON response
-                        data = json.loads(text)
-
-                        # Calculate total traffic and bandwidth metrics
-                        total_traffic_bytes = 0
-                        bandwidth_values = []
-                        data_points = []
-
-                        # Data format: [{"time":"2025-11-26T00:00:00+08:00","values":{"flow":0}}, ...]
-                        for item in data:
-                            if isinstance(item, dict) and "values" in item and "flow" in item["values"]:
-                                flow_bytes = item["values"]["flow"]
-                                total_traffic_bytes += flow_bytes
-
-                                # Convert to bandwidth: flow is accumulated over 5 minutes (300 seconds)
-                                # Bandwidth (bps) = bytes / 300 seconds * 8 bits/byte
-                                bandwidth_bps = (flow_bytes / 300) * 8
-                                bandwidth_values.append(bandwidth_bps)
-
-                                # Store data point with timestamp
-                                data_points.append({
-                                    "time": item.get("time", ""),
-                                    "traffic_bytes": flow_bytes,
-                                    "bandwidth_bps": bandwidth_bps
-                                })
-
-                        # Calculate average and peak bandwidth
-                        avg_bandwidth_bps = sum(bandwidth_values) / len(bandwidth_values) if bandwidth_values else 0
-                        peak_bandwidth_bps = max(bandwidth_values) if bandwidth_values else 0
-
-                        # Convert to human-readable units
-                        def format_bytes(bytes_val):
-                            """Convert bytes to human-readable format"""
-                            for unit in ['B', 'KB', 'MB', 'GB', 'TB']:
-                                if bytes_val < 1024.0:
-                                    return f"{bytes_val:.2f} {unit}"
-                                bytes_val /= 1024.0
-                            return f"{bytes_val:.2f} PB"
-
-                        def format_bandwidth(bps):
-                            """Convert bits per second to human-readable format"""
-                            for unit in ['bps', 'Kbps', 'Mbps', 'Gbps', 'Tbps']:
-                                if bps < 1000.0:
-                                    return f"{bps:.2f} {unit}"
-                                bps /= 1000.0
-                            return f"{bps:.2f} Pbps"
-
-                        result = {
-                            "status": "success",
-                            "begin": begin,
-                            "end": end,
-                            "summary": {
-                                "total_traffic_bytes": total_traffic_bytes,
-                                "total_traffic_formatted": format_bytes(total_traffic_bytes),
-                                "data_points_count": len(data_points),
-                                "average_bandwidth_bps": avg_bandwidth_bps,
-                                "average_bandwidth_formatted": format_bandwidth(avg_bandwidth_bps),
-                                "peak_bandwidth_bps": peak_bandwidth_bps,
-                                "peak_bandwidth_formatted": format_bandwidth(peak_bandwidth_bps),
-                                "granularity": "5 minutes"
-                            },
-                            "message": "Traffic statistics calculated successfully",
-                            "status_code": status
-                        }
-
-                        # Include raw data only if requested
-                        if include_raw_data:
-                            result["raw_data"] = data
-                            result["data_points"] = data_points
-
-                        return result
-
-                    except json.JSONDecodeError as e:
-                        logger.error(f"Failed to parse JSON response: {e}")
-                        return {
-                            "status": "error",
-                            "begin": begin,
-                            "end": end,
-                            "message": f"Failed to parse traffic stats response: {str(e)}",
-                            "raw_response": text,
-                            "status_code": status
-                        }
-                    except Exception as e:
-                        logger.error(f"Error processing traffic stats: {e}")
-                        return {
-                            "status": "error",
-                            "begin": begin,
-                            "end": end,
-                            "message": f"Error processing traffic stats: {str(e)}",
-                            "status_code": status
-                        }
-                else:
-                    logger.error(f"Failed to query traffic stats, status: {status}, response: {text}")
-                    return {
-                        "status": "error",
-                        "begin": begin,
-                        "end": end,
-                        "message": f"Failed to query traffic stats: {text}",
-                        "status_code": status
-                    }
-
+        cache_key = (begin, end, include_raw_data)
+        cached = self._stats_cache.get(cache_key)
+        if cached is not None:
+            logger.debug("Using cached live traffic stats from %s to %s", begin, end)
+            return cached
+
+        # Quote the caller-supplied values so the signed URL and the sent URL are the same
+        # string; yarl is then told it is already encoded and skips its own requoting pass.
+        url = (
+            f"{self._stats_url}?trafficStats&begin={quote(begin, safe='')}&end={quote(end, safe='')}"
+            "&g=5min&select=flow&flow=downflow"
+        )
+        headers = self._get_auth_header_for_get(url)
+
+        logger.debug("Querying live traffic stats from %s to %s", begin, end)
+
+        session = await self._get_session()
+        async with session.get(
+                yarl.URL(url, encoded=True), headers=headers, timeout=self._timeouts["query_live_traffic_stats"]
+        ) as response:
+            status = response.status
+
+            if status == 200:
+                logger.debug("Successfully queried live traffic stats")
+                raw = await response.read()
+
+                try:
+                    # Parse JSON straight from the body bytes, no intermediate str
+                    data = json.loads(raw)
+
+                    # Calculate total traffic and bandwidth metrics
+                    total_traffic_bytes = 0
+                    bandwidth_values = []
+                    data_points = []
+
+                    # Data format: [{"time":"2025-11-26T00:00:00+08:00","values":{"flow":0}}, ...]
+                    for item in data:
+                        if isinstance(item, dict) and "values" in item and "flow" in item["values"]:
+                            flow_bytes = item["values"]["flow"]
+                            total_traffic_bytes += flow_bytes
+
+                            # Convert to bandwidth: flow is accumulated over 5 minutes (300 seconds)
+                            # Bandwidth (bps) = bytes / 300 seconds * 8 bits/byte
+                            bandwidth_bps = (flow_bytes / 300) * 8
+                            bandwidth_values.append(bandwidth_bps)
+
+                            # Store data point with timestamp
+                            data_points.append({
+                                "time": item.get("time", ""),
+                                "traffic_bytes": flow_bytes,
+                                "bandwidth_bps": bandwidth_bps
+                            })
+
+                    # Calculate average and peak bandwidth
+                    avg_bandwidth_bps = sum(bandwidth_values) / len(bandwidth_values) if bandwidth_values else 0
+                    peak_bandwidth_bps = max(bandwidth_values) if bandwidth_values else 0
+
+                    # Convert to human-readable units
+                    def format_bytes(bytes_val):
+                        """Convert bytes to human-readable format"""
+                        for unit in ['B', 'KB', 'MB', 'GB', 'TB']:
+                            if bytes_val < 1024.0:
+                                return f"{bytes_val:.2f} {unit}"
+                            bytes_val /= 1024.0
+                        return f"{bytes_val:.2f} PB"
+
+                    def format_bandwidth(bps):
+                        """Convert bits per second to human-readable format"""
+                        for unit in ['bps', 'Kbps', 'Mbps', 'Gbps', 'Tbps']:
+                            if bps < 1000.0:
+                                return f"{bps:.2f} {unit}"
+                            bps /= 1000.0
+                        return f"{bps:.2f} Pbps"
+
+                    result = _ok(
+                        "Traffic statistics calculated successfully",
+                        status_code=status,
+                        begin=begin,
+                        end=end,
+                        summary={
+                            "total_traffic_bytes": total_traffic_bytes,
+                            "total_traffic_formatted": format_bytes(total_traffic_bytes),
+                            "data_points_count": len(data_points),
+                            "average_bandwidth_bps": avg_bandwidth_bps,
+                            "average_bandwidth_formatted": format_bandwidth(avg_bandwidth_bps),
+                            "peak_bandwidth_bps": peak_bandwidth_bps,
+                            "peak_bandwidth_formatted": format_bandwidth(peak_bandwidth_bps),
+                            "granularity": "5 minutes"
+                        },
+                    )
+
+                    # Include raw data only if requested
+                    if include_raw_data:
+                        result["raw_data"] = data
+                        result["data_points"] = data_points
+
+                    self._stats_cache.set(cache_key, result)
+                    return result
+
+                except json.JSONDecodeError as e:
+                    logger.error("Failed to parse JSON response: %s", e)
+                    return _err(
+                        f"Failed to parse traffic stats response: {str(e)}",
+                        status_code=status,
+                        begin=begin,
+                        end=end,
+                        raw_response=raw.decode("utf-8", errors="replace"),
+                    )
+                except Exception as e:
+                    logger.error("Error processing traffic stats: %s", e)
+                    return _err(f"Error processing traffic stats: {str(e)}", status_code=status, begin=begin, end=end)
+            else:
+                text = await _read_error_text(response)
+                logger.error("Failed to query traffic stats, status: %s, response: %s", status, text)
+                return _err(f"Failed to query traffic stats: {text}", status_code=status, begin=begin, end=end)
+
+    @_timeout_as_error
     async def list_buckets(self) -> Dict[str, Any]:
         """
         List all live streaming spaces/buckets
@@ -487,42 +792,31 @@ class LiveStreamingService:
         Returns:
             Dict containing the list of buckets
         """
-        if not self.live_endpoint:
-            self.live_endpoint = "mls.cn-east-1.qiniumiku.com"
-
-        # Remove protocol to get base endpoint
-        endpoint = self.live_endpoint
-        if endpoint.startswith("http://"):
-            endpoint = endpoint[7:]
-        elif endpoint.startswith("https://"):
-            endpoint = endpoint[8:]
-
-        url = f"https://{endpoint}/"
-        headers = self._get_auth_header(method="GET", url=url)
-
-        logger.info(f"Listing all live streaming buckets from {url}")
-
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, headers=headers) as response:
-                status = response.status
-                text = await response.text()
-
-                if status == 200:
-                    logger.info("Successfully listed all buckets")
-                    return {
-                        "status": "success",
-                        "data": text,
-                        "message": "Buckets listed successfully",
-                        "status_code": status
-                    }
-                else:
-                    logger.error(f"Failed to list buckets, status: {status}, response: {text}")
-                    return {
-                        "status": "error",
-                        "message": f"Failed to list buckets: {text}",
-                        "status_code": status
-                    }
-
+        cached = self._buckets_cache.get(None)
+        if cached is not None:
+            logger.debug("Using cached live streaming bucket list")
+            return cached
+
+        url = self._api_url
+        headers = self._get_list_headers(url)
+
+        logger.debug("Listing all live streaming buckets from %s", url)
+
+        session = await self._get_session()
+        async with session.get(url, headers=headers) as response:
+            status = response.status
+
+            if status == 200:
+                logger.debug("Successfully listed all buckets")
+                result = _ok("Buckets listed successfully", status_code=status, data=await _read_json(response))
+                self._buckets_cache.set(None, result)
+                return result
+            else:
+                text = await _read_error_text(response)
+                logger.error("Failed to list buckets, status: %s, response: %s", status, text)
+                return _err(f"Failed to list buckets: {text}", status_code=status)
+
+    @_timeout_as_error
     async def list_streams(self, bucket_id: str) -> Dict[str, Any]:
         """
         List all streams in a specific live streaming bucket
@@ -533,118 +827,69 @@ class LiveStreamingService:
         Returns:
             Dict containing the list of streams in the bucket
         """
-        if not self.live_endpoint:
-            self.live_endpoint = "mls.cn-east-1.qiniumiku.com"
-
-        # Remove protocol to get base endpoint
-        endpoint = self.live_endpoint
-        if endpoint.startswith("http://"):
-            endpoint = endpoint[7:]
-        elif endpoint.startswith("https://"):
-            endpoint = endpoint[8:]
-
-        url = f"https://{endpoint}/?streamlist&bucketId={bucket_id}"
-        headers = self._get_auth_header(method="GET", url=url)
-
-        logger.info(f"Listing streams in bucket: {bucket_id}")
-
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, headers=headers) as response:
-                status = response.status
-                text = await response.text()
-
-                if status == 200:
-                    logger.info(f"Successfully listed streams in bucket: {bucket_id}")
-                    return {
-                        "status": "success",
-                        "bucket_id": bucket_id,
-                        "data": text,
-                        "message": f"Streams in bucket '{bucket_id}' listed successfully",
-                        "status_code": status
-                    }
-                else:
-                    logger.error(f"Failed to list streams in bucket: {bucket_id}, status: {status}, response: {text}")
-                    return {
-                        "status": "error",
-                        "bucket_id": bucket_id,
-                        "message": f"Failed to list streams: {text}",
-                        "status_code": status
-                    }
-
-    def _generate_qiniu_token(self, method: str, url: str, content_type: Optional[str] = None, body: Optional[str] = None) -> str:
-        if not self.access_key or not self.secret_key:
+        url = f"{self._api_url}?streamlist&bucketId={bucket_id}"
+        headers = self._get_list_headers(url)
+
+        logger.debug("Listing streams in bucket: %s", bucket_id)
+
+        session = await self._get_session()
+        async with session.get(url, headers=headers) as response:
+            status = response.status
+
+            if status == 200:
+                logger.debug("Successfully listed streams in bucket: %s", bucket_id)
+                return _ok(
+                    f"Streams in bucket '{bucket_id}' listed successfully",
+                    status_code=status,
+                    bucket_id=bucket_id,
+                    data=await _read_json(response),
+                )
+            else:
+                text = await _read_error_text(response)
+                logger.error("Failed to list streams in bucket: %s, status: %s, response: %s", bucket_id, status, text)
+                return _err(f"Failed to list streams: {text}", status_code=status, bucket_id=bucket_id)
+
+    async def list_streams_many(self, bucket_ids: List[str]) -> List[Dict[str, Any]]:
+        """
+        List streams of several buckets concurrently
+
+        Args:
+            bucket_ids: The bucket IDs/names to list streams from
+
+        Returns:
+            One list_streams result per bucket, in the order of bucket_ids
+        """
+        return list(await asyncio.gather(*(self.list_streams(bucket_id) for bucket_id in bucket_ids)))
+
+    def _generate_qiniu_token(self, method: str, url: str, content_type: Optional[str] = None, body: Optional[Union[str, bytes]] = None) -> str:
+        # The signer only exists when a secret key was configured
+        if self._sign is None:
             raise ValueError("QINIU_ACCESS_KEY and QINIU_SECRET_KEY are required")
         # Parse the URL
-        parsed = urlparse(url)
+        host, path, query = _split_url(url)
 
         # 1. Add Method and Path
-        data = f"{method} {parsed.path or '/'}"
+        parts = [method.encode('utf-8'), b" ", path.encode('utf-8')]
 
         # 2. Add Query if exists
-        if parsed.query:
-            data += f"?{parsed.query}"
+        if query:
+            parts += [b"?", query.encode('utf-8')]
 
         # 3. Add Host
-        data += f"\nHost: {parsed.hostname}"
+        parts += [b"\nHost: ", host.encode('utf-8')]
 
         # 4. Add Content-Type if exists and not empty
         if content_type:
-            data += f"\nContent-Type: {content_type}"
+            parts += [b"\nContent-Type: ", content_type.encode('utf-8')]
 
         # 5. Add newlines
-        data += "\n\n"
+        parts.append(b"\n\n")
 
         # 6. Add Body if conditions are met
         # bodyOK: Content-Length exists and Body is not empty
         # contentTypeOK: Content-Type exists and is not "application/octet-stream"
-        if body:
-            body_ok = len(body) > 0
-            content_type_ok = content_type and content_type != "application/octet-stream"
-
-            if body_ok and content_type_ok:
-                data += body
-
-        # 7. Calculate HMAC-SHA1 signature
-        secret_bytes = self.secret_key.encode('utf-8')
-        data_bytes = data.encode('utf-8')
-        sign = hmac.new(secret_bytes, data_bytes, hashlib.sha1).digest()
-
-        # 8. URL-safe Base64 encode
-        encoded_pre = base64.b64encode(sign).decode('utf-8')
-        encoded_sign = encoded_pre.replace('+', '-').replace('/', '_')
-
-        # 9. Construct and return the Qiniu token
-        qiniu_token = f"{self.access_key}:{encoded_sign}"
-        return qiniu_token
-
-
-
-
-
-
-def generate_signature(method, url, body, ak, sk):
-    parsed_url = urlparse(url)
-
-    # 构建签名数据
-    data = method + " " + parsed_url.path
-
-    if parsed_url.query:
-        data += "?" + parsed_url.query
-
-    data += "\nHost: " + parsed_url.hostname
-    data += "\nContent-Type: application/json"
-
-    if body:
-        data += "\n\n" + body
-    print(data)
-    # 使用HMAC-SHA1进行签名
-    hmac_sha1 = hmac.new(sk.encode('utf-8'), data.encode('utf-8'), hashlib.sha1)
-    hmac_result = hmac_sha1.digest()
-
-    sign = ak + ":" + base64_url_safe_encode(hmac_result)
-    return sign
+        if body and content_type and content_type != "application/octet-stream":
+            parts.append(body.encode('utf-8') if isinstance(body, str) else body)
 
-def base64_url_safe_encode(data):
-    encoded = base64.b64encode(data).decode('utf-8')
-    encoded = encoded.replace('+', '-').replace('/', '_')
-    return encoded
+        # 7. HMAC-SHA1 sign, URL-safe Base64 encode and prefix with the access key
+        return self._sign(b"".join(parts))
@@ -1,5 +1,8 @@
+import inspect
 import logging
 
+from typing import Optional
+
 from mcp import types
 
 from .live_streaming import LiveStreamingService
@@ -11,246 +14,285 @@ logger = logging.getLogger(consts.LOGGER_NAME)
 _BUCKET_DESC = "LiveStreaming bucket name"
 _STREAM_DESC = "LiveStreaming stream name"
 
+# Input schema properties shared by several tools
+_BUCKET_PROP = {"type": "string", "description": _BUCKET_DESC}
+_STREAM_PROP = {"type": "string", "description": _STREAM_DESC}
+_STREAM_NAME_PROP = {"type": "string", "description": "The stream name"}
+_PUSH_DOMAIN_PROP = {"type": "string", "description": "The push domain name (e.g., mcp-push1.qiniu.com)"}
+_PLAY_DOMAIN_PROP = {"type": "string", "description": "The playback domain name (e.g., mcp-play1.qiniu.com)"}
+_PUSH_DOMAIN_TYPE_PROP = {
+    "type": "string",
+    "description": "The type of push domain (default: pushRtmp)",
+    "default": "pushRtmp",
+}
+_PLAY_DOMAIN_TYPE_PROP = {
+    "type": "string",
+    "description": "The type of playback domain (default: live)",
+    "default": "live",
+}
 
-class _ToolImpl:
-    def __init__(self, live_streaming: LiveStreamingService):
-        self.live_streaming = live_streaming
 
-    @tools.tool_meta(
-        types.Tool(
-            name="live_streaming_create_bucket",
-            description="Create a new bucket in LiveStreaming using S3-style API. The bucket will be created at https://<bucket>.<endpoint_url>",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "bucket": {
-                        "type": "string",
-                        "description": _BUCKET_DESC,
-                    },
-                },
-                "required": ["bucket"],
-            },
-        )
-    )
-    async def create_bucket(self, **kwargs) -> list[types.TextContent]:
-        result = await self.live_streaming.create_bucket(**kwargs)
-        return [types.TextContent(type="text", text=str(result))]
-
-    @tools.tool_meta(
-        types.Tool(
-            name="live_streaming_create_stream",
-            description="Create a new stream in LiveStreaming using S3-style API. The stream will be created at https://<bucket>.<endpoint_url>/<stream>",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "bucket": {
-                        "type": "string",
-                        "description": _BUCKET_DESC,
-                    },
-                    "stream": {
-                        "type": "string",
-                        "description": _STREAM_DESC,
-                    },
-                },
-                "required": ["bucket", "stream"],
-            },
-        )
-    )
-    async def create_stream(self, **kwargs) -> list[types.TextContent]:
-        result = await self.live_streaming.create_stream(**kwargs)
-        return [types.TextContent(type="text", text=str(result))]
-
-    @tools.tool_meta(
-        types.Tool(
-            name="live_streaming_bind_push_domain",
-            description="Bind a push domain to a LiveStreaming bucket for live streaming. This allows you to configure the domain for pushing RTMP/WHIP streams.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "bucket": {
-                        "type": "string",
-                        "description": _BUCKET_DESC,
-                    },
-                    "domain": {
-                        "type": "string",
-                        "description": "The push domain name (e.g., mcp-push1.qiniu.com)",
-                    },
-                    "domain_type": {
-                        "type": "string",
-                        "description": "The type of push domain (default: pushRtmp)",
-                        "default": "pushRtmp",
-                    },
-                },
-                "required": ["bucket", "domain"],
-            },
-        )
-    )
-    async def bind_push_domain(self, **kwargs) -> list[types.TextContent]:
-        result = await self.live_streaming.bind_push_domain(**kwargs)
-        return [types.TextContent(type="text", text=str(result))]
-
-    @tools.tool_meta(
-        types.Tool(
-            name="live_streaming_bind_play_domain",
-            description="Bind a playback domain to a LiveStreaming bucket for live streaming. This allows you to configure the domain for playing back streams via FLV/M3U8/WHEP.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "bucket": {
-                        "type": "string",
-                        "description": _BUCKET_DESC,
-                    },
-                    "domain": {
-                        "type": "string",
-                        "description": "The playback domain name (e.g., mcp-play1.qiniu.com)",
-                    },
-                    "domain_type": {
-                        "type": "string",
-                        "description": "The type of playback domain (default: live)",
-                        "default": "live",
-                    },
-                },
-                "required": ["bucket", "domain"],
-            },
-        )
-    )
-    async def bind_play_domain(self, **kwargs) -> list[types.TextContent]:
-        result = await self.live_streaming.bind_play_domain(**kwargs)
-        return [types.TextContent(type="text", text=str(result))]
-
-    @tools.tool_meta(
-        types.Tool(
-            name="live_streaming_get_push_urls",
-            description="Get push URLs for a stream. Returns RTMP and WHIP push URLs that can be used to push live streams.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "push_domain": {
-                        "type": "string",
-                        "description": "The push domain name",
-                    },
-                    "bucket": {
-                        "type": "string",
-                        "description": _BUCKET_DESC,
-                    },
-                    "stream_name": {
-                        "type": "string",
-                        "description": "The stream name",
-                    },
-                },
-                "required": ["push_domain", "bucket", "stream_name"],
+def _pack(result) -> list[types.TextContent]:
+    """Serialize a service result as compact JSON text content"""
+    return [types.TextContent(type="text", text=tools.dumps(result))]
+
+
+def _service_tool(method: str, meta: types.Tool):
+    """Build a _ToolImpl method that forwards its arguments to LiveStreamingService.<method>"""
+    if inspect.iscoroutinefunction(getattr(LiveStreamingService, method)):
+        async def forward(self, **kwargs) -> list[types.TextContent]:
+            return _pack(await getattr(self.live_streaming, method)(**kwargs))
+    else:
+        async def forward(self, **kwargs) -> list[types.TextContent]:
+            return _pack(getattr(self.live_streaming, method)(**kwargs))
+    forward.__name__ = forward.__qualname__ = method
+    return tools.tool_meta(meta)(forward)
+
+
+_CREATE_BUCKET_TOOL = types.Tool(
+    name="live_streaming_create_bucket",
+    description="Create a new bucket in LiveStreaming using S3-style API. The bucket will be created at https://<bucket>.<endpoint_url>",
+    inputSchema={
+        "type": "object",
+        "properties": {
+            "bucket": _BUCKET_PROP,
+        },
+        "required": ["bucket"],
+    },
+)
+
+
+_CREATE_STREAM_TOOL = types.Tool(
+    name="live_streaming_create_stream",
+    description="Create a new stream in LiveStreaming using S3-style API. The stream will be created at https://<bucket>.<endpoint_url>/<stream>",
+    inputSchema={
+        "type": "object",
+        "properties": {
+            "bucket": _BUCKET_PROP,
+            "stream": _STREAM_PROP,
+        },
+        "required": ["bucket", "stream"],
+    },
+)
+
+
+_BIND_PUSH_DOMAIN_TOOL = types.Tool(
+    name="live_streaming_bind_push_domain",
+    description="Bind a push domain to a LiveStreaming bucket for live streaming. This allows you to configure the domain for pushing RTMP/WHIP streams.",
+    inputSchema={
+        "type": "object",
+        "properties": {
+            "bucket": _BUCKET_PROP,
+            "domain": _PUSH_DOMAIN_PROP,
+            "domain_type": _PUSH_DOMAIN_TYPE_PROP,
+        },
+        "required": ["bucket", "domain"],
+    },
+)
+
+
+_BIND_PLAY_DOMAIN_TOOL = types.Tool(
+    name="live_streaming_bind_play_domain",
+    description="Bind a playback domain to a LiveStreaming bucket for live streaming. This allows you to configure the domain for playing back streams via FLV/M3U8/WHEP.",
+    inputSchema={
+        "type": "object",
+        "properties": {
+            "bucket": _BUCKET_PROP,
+            "domain": _PLAY_DOMAIN_PROP,
+            "domain_type": _PLAY_DOMAIN_TYPE_PROP,
+        },
+        "required": ["bucket", "domain"],
+    },
+)
+
+
+_BIND_DOMAINS_TOOL = types.Tool(
+    name="live_streaming_bind_domains",
+    description="Bind a push domain and a playback domain to a LiveStreaming bucket in one call. Both bindings are sent concurrently and the result of each is returned.",
+    inputSchema={
+        "type": "object",
+        "properties": {
+            "bucket": _BUCKET_PROP,
+            "push_domain": _PUSH_DOMAIN_PROP,
+            "play_domain": _PLAY_DOMAIN_PROP,
+            "push_domain_type": _PUSH_DOMAIN_TYPE_PROP,
+            "play_domain_type": _PLAY_DOMAIN_TYPE_PROP,
+        },
+        "required": ["bucket", "push_domain", "play_domain"],
+    },
+)
+
+
+_PROVISION_TOOL = types.Tool(
+    name="live_streaming_provision",
+    description="Set up a LiveStreaming bucket in one call: create the bucket, then concurrently create a stream in it and bind its push and playback domains. Returns the result of each step.",
+    inputSchema={
+        "type": "object",
+        "properties": {
+            "bucket": _BUCKET_PROP,
+            "stream": _STREAM_PROP,
+            "push_domain": _PUSH_DOMAIN_PROP,
+            "play_domain": _PLAY_DOMAIN_PROP,
+            "push_domain_type": _PUSH_DOMAIN_TYPE_PROP,
+            "play_domain_type": _PLAY_DOMAIN_TYPE_PROP,
+        },
+        "required": ["bucket", "stream", "push_domain", "play_domain"],
+    },
+)
+
+
+_GET_PUSH_URLS_TOOL = types.Tool(
+    name="live_streaming_get_push_urls",
+    description="Get push URLs for a stream. Returns RTMP and WHIP push URLs that can be used to push live streams.",
+    inputSchema={
+        "type": "object",
+        "properties": {
+            "push_domain": _PUSH_DOMAIN_PROP,
+            "bucket": _BUCKET_PROP,
+            "stream_name": _STREAM_NAME_PROP,
+        },
+        "required": ["push_domain", "bucket", "stream_name"],
+    },
+)
+
+
+_GET_PLAY_URLS_TOOL = types.Tool(
+    name="live_streaming_get_play_urls",
+    description="Get playback URLs for a stream. Returns FLV, M3U8, and WHEP playback URLs that can be used to play live streams.",
+    inputSchema={
+        "type": "object",
+        "properties": {
+            "play_domain": _PLAY_DOMAIN_PROP,
+            "bucket": _BUCKET_PROP,
+            "stream_name": _STREAM_NAME_PROP,
+        },
+        "required": ["play_domain", "bucket", "stream_name"],
+    },
+)
+
+
+_QUERY_LIVE_TRAFFIC_STATS_TOOL = types.Tool(
+    name="live_streaming_query_live_traffic_stats",
+    description="Query live streaming traffic statistics for a time range. Returns total traffic (bytes), average bandwidth (bps), peak bandwidth (bps), and optionally raw data for download.",
+    inputSchema={
+        "type": "object",
+        "properties": {
+            "begin": {
+                "type": "string",
+                "description": "Start time in format YYYYMMDDHHMMSS (e.g., 20240101000000)",
             },
-        )
-    )
-    async def get_push_urls(self, **kwargs) -> list[types.TextContent]:
-        result = self.live_streaming.get_push_urls(**kwargs)
-        return [types.TextContent(type="text", text=str(result))]
-
-    @tools.tool_meta(
-        types.Tool(
-            name="live_streaming_get_play_urls",
-            description="Get playback URLs for a stream. Returns FLV, M3U8, and WHEP playback URLs that can be used to play live streams.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "play_domain": {
-                        "type": "string",
-                        "description": "The playback domain name",
-                    },
-                    "bucket": {
-                        "type": "string",
-                        "description": _BUCKET_DESC,
-                    },
-                    "stream_name": {
-                        "type": "string",
-                        "description": "The stream name",
-                    },
-                },
-                "required": ["play_domain", "bucket", "stream_name"],
+            "end": {
+                "type": "string",
+                "description": "End time in format YYYYMMDDHHMMSS (e.g., 20240129105148)",
             },
-        )
-    )
-    async def get_play_urls(self, **kwargs) -> list[types.TextContent]:
-        result = self.live_streaming.get_play_urls(**kwargs)
-        return [types.TextContent(type="text", text=str(result))]
-
-    @tools.tool_meta(
-        types.Tool(
-            name="live_streaming_query_live_traffic_stats",
-            description="Query live streaming traffic statistics for a time range. Returns total traffic (bytes), average bandwidth (bps), peak bandwidth (bps), and optionally raw data for download.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "begin": {
-                        "type": "string",
-                        "description": "Start time in format YYYYMMDDHHMMSS (e.g., 20240101000000)",
-                    },
-                    "end": {
-                        "type": "string",
-                        "description": "End time in format YYYYMMDDHHMMSS (e.g., 20240129105148)",
-                    },
-                    "include_raw_data": {
-                        "type": "boolean",
-                        "description": "If true, includes raw JSON data and detailed data points for download. Default is false.",
-                        "default": False,
-                    },
-                },
-                "required": ["begin", "end"],
+            "include_raw_data": {
+                "type": "boolean",
+                "description": "If true, includes raw JSON data and detailed data points for download. Default is false.",
+                "default": False,
             },
-        )
-    )
-    async def query_live_traffic_stats(self, **kwargs) -> list[types.TextContent]:
-        result = await self.live_streaming.query_live_traffic_stats(**kwargs)
-        return [types.TextContent(type="text", text=str(result))]
-
-    @tools.tool_meta(
-        types.Tool(
-            name="live_streaming_list_buckets",
-            description="List all live streaming spaces/buckets. Returns information about all available live streaming buckets.",
-            inputSchema={
-                "type": "object",
-                "properties": {},
-                "required": [],
+        },
+        "required": ["begin", "end"],
+    },
+)
+
+
+_LIST_BUCKETS_TOOL = types.Tool(
+    name="live_streaming_list_buckets",
+    description="List all live streaming spaces/buckets. Returns information about all available live streaming buckets.",
+    inputSchema={
+        "type": "object",
+        "properties": {},
+        "required": [],
+    },
+)
+
+
+_LIST_STREAMS_TOOL = types.Tool(
+    name="live_streaming_list_streams",
+    description="List all streams in a specific live streaming bucket. Returns the list of streams for the given bucket ID.",
+    inputSchema={
+        "type": "object",
+        "properties": {
+            "bucket_id": {
+                "type": "string",
+                "description": "The bucket ID/name to list streams from",
             },
-        )
-    )
-    async def list_buckets(self, **kwargs) -> list[types.TextContent]:
-        result = await self.live_streaming.list_buckets(**kwargs)
-        return [types.TextContent(type="text", text=str(result))]
-
-    @tools.tool_meta(
-        types.Tool(
-            name="live_streaming_list_streams",
-            description="List all streams in a specific live streaming bucket. Returns the list of streams for the given bucket ID.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "bucket_id": {
-                        "type": "string",
-                        "description": "The bucket ID/name to list streams from",
-                    },
-                },
-                "required": ["bucket_id"],
+        },
+        "required": ["bucket_id"],
+    },
+)
+
+
+_LIST_STREAMS_MANY_TOOL = types.Tool(
+    name="live_streaming_list_streams_many",
+    description="List the streams of several live streaming buckets at once. The buckets are queried concurrently and one result is returned per bucket ID.",
+    inputSchema={
+        "type": "object",
+        "properties": {
+            "bucket_ids": {
+                "type": "array",
+                "items": {"type": "string"},
+                "description": "The bucket IDs/names to list streams from",
             },
-        )
-    )
-    async def list_streams(self, **kwargs) -> list[types.TextContent]:
-        result = await self.live_streaming.list_streams(**kwargs)
-        return [types.TextContent(type="text", text=str(result))]
+        },
+        "required": ["bucket_ids"],
+    },
+)
+
+
+class _ToolImpl:
+    def __init__(self, live_streaming: LiveStreamingService):
+        self.live_streaming = live_streaming
+
+    create_bucket = _service_tool("create_bucket", _CREATE_BUCKET_TOOL)
+    create_stream = _service_tool("create_stream", _CREATE_STREAM_TOOL)
+    bind_push_domain = _service_tool("bind_push_domain", _BIND_PUSH_DOMAIN_TOOL)
+    bind_play_domain = _service_tool("bind_play_domain", _BIND_PLAY_DOMAIN_TOOL)
+    bind_domains = _service_tool("bind_domains", _BIND_DOMAINS_TOOL)
+    provision = _service_tool("provision", _PROVISION_TOOL)
+    get_push_urls = _service_tool("get_push_urls", _GET_PUSH_URLS_TOOL)
+    get_play_urls = _service_tool("get_play_urls", _GET_PLAY_URLS_TOOL)
+    query_live_traffic_stats = _service_tool("query_live_traffic_stats", _QUERY_LIVE_TRAFFIC_STATS_TOOL)
+    list_buckets = _service_tool("list_buckets", _LIST_BUCKETS_TOOL)
+    list_streams = _service_tool("list_streams", _LIST_STREAMS_TOOL)
+    list_streams_many = _service_tool("list_streams_many", _LIST_STREAMS_MANY_TOOL)
+
+
+# The registered tools are bound to this instance; loading again only swaps its service
+_tool_impl: Optional[_ToolImpl] = None
+
 
+def register_tools(live_streaming: LiveStreamingService) -> LiveStreamingService:
+    """
+    Register the live streaming tools and return the service they are bound to.
+    A replaced service is not closed here: its HTTP session belongs to the
+    serving loop, so core.close() closes it there.
+    """
+    global _tool_impl
+    if _tool_impl is not None:
+        previous = _tool_impl.live_streaming
+        if previous.config == live_streaming.config:
+            # Same config: keep the existing service and its pooled connections
+            return previous
+        _tool_impl.live_streaming = live_streaming
+        return live_streaming
 
-def register_tools(live_streaming: LiveStreamingService):
     tool_impl = _ToolImpl(live_streaming)
+    _tool_impl = tool_impl
     tools.auto_register_tools(
         [
             tool_impl.create_bucket,
             tool_impl.create_stream,
             tool_impl.bind_push_domain,
             tool_impl.bind_play_domain,
+            tool_impl.bind_domains,
+            tool_impl.provision,
             tool_impl.get_push_urls,
             tool_impl.get_play_urls,
             tool_impl.query_live_traffic_stats,
             tool_impl.list_buckets,
             tool_impl.list_streams,
+            tool_impl.list_streams_many,
         ]
     )
+    return live_streaming
@@ -64,11 +64,7 @@ class _ToolImpl:
         return [
             types.TextContent(
                 type="text",
-                text=str(
-                    {
-                        "object_url": object_url,
-                    }
-                ),
+                text=tools.dumps({"object_url": object_url}),
             )
         ]
 
@@ -124,11 +120,7 @@ class _ToolImpl:
         return [
             types.TextContent(
                 type="text",
-                text=str(
-                    {
-                        "object_url": object_url,
-                    }
-                ),
+                text=tools.dumps({"object_url": object_url}),
             )
         ]
 
@@ -191,9 +183,7 @@ class _ToolImpl:
         return [
             types.TextContent(
                 type="text",
-                text=str({
-                    "object_url": object_url,
-                })
+                text=tools.dumps({"object_url": object_url})
             )
         ]
 
@@ -228,9 +218,7 @@ class _ToolImpl:
         return [
             types.TextContent(
                 type="text",
-                text=str({
-                    "object_url": object_url,
-                })
+                text=tools.dumps({"object_url": object_url})
             )
         ]
 
@@ -252,7 +240,7 @@ class _ToolImpl:
     )
     def get_fop_status(self, **kwargs) -> list[types.TextContent]:
         status = self.client.get_fop_status(**kwargs)
-        return [types.TextContent(type="text", text=str(status))]
+        return [types.TextContent(type="text", text=tools.dumps(status))]
 
 
 def register_tools(cfg: config.Config, cli: MediaProcessingService):
@@ -8,6 +8,7 @@ def load(cfg: config.Config):
     storage = StorageService(cfg)
     register_tools(storage)
     register_resource_provider(storage)
+    return storage
 
 
 __all__ = ["load"]
@@ -1,6 +1,5 @@
 import asyncio
 import logging
-import base64
 
 from mcp import types
 from urllib.parse import unquote
@@ -51,9 +50,10 @@ class _ResourceProvider(resource.ResourceProvider):
                     for obj in objects:
                         if "Key" in obj and not obj["Key"].endswith("/"):
                             object_key = obj["Key"]
-                            if self.storage.is_markdown_file(object_key):
+                            kind = self.storage.classify(object_key)
+                            if kind == "markdown":
                                 mime_type = "text/markdown"
-                            elif self.storage.is_image_file(object_key):
+                            elif kind == "image":
                                 mime_type = "image/png"
                             else:
                                 mime_type = "text/plain"
@@ -119,11 +119,9 @@ class _ResourceProvider(resource.ResourceProvider):
         file_content = response["Body"]
 
         content_type = response.get("ContentType", "application/octet-stream")
-        # 根据内容类型返回不同的响应
-        if content_type.startswith("image/"):
-            file_content = base64.b64encode(file_content).decode("utf-8")
-
-        return [ReadResourceContents(mime_type=content_type, content=file_content)]
+        # 图片直接返回 bytes，由 MCP SDK 作为 blob 资源编码一次，不再先编码成文本；
+        # get_object 可能返回 bytearray，SDK 只识别 bytes
+        return [ReadResourceContents(mime_type=content_type, content=bytes(file_content))]
 
 
 def register_resource_provider(storage: StorageService):
@@ -1,15 +1,159 @@
+import asyncio
 import aioboto3
+import base64
+import functools
+import hashlib
+import hmac
 import logging
 import qiniu
+import time
 
-from typing import List, Dict, Any, Optional
+from collections import OrderedDict
+from contextlib import AsyncExitStack
+from itertools import islice
+from typing import AsyncIterator, Callable, List, Dict, Any, Optional
 from botocore.config import Config as S3Config
+from botocore.exceptions import ClientError
+from qiniu.http.default_client import qn_http_client
+from requests.adapters import HTTPAdapter
 
+from ...cache import cache
 from ...config import config
 from ...consts import consts
 
 logger = logging.getLogger(consts.LOGGER_NAME)
 
+# bucket 下载域名、私有属性的缓存时间（秒）
+_BUCKET_META_CACHE_TTL = 300
+
+# list_buckets / list_objects 结果的缓存时间（秒），上传等写操作会清空对象列表缓存
+_LIST_CACHE_TTL = 30
+
+# qiniu SDK 共享 requests Session 的连接池大小；同步工具在线程池中并发执行，
+# 连接池不小于线程数时连接才能全部复用，不会在归还时被丢弃
+_QINIU_CONNECTION_POOL_SIZE = 50
+
+# qiniu.config 的 connection_pool 只作用于 http:// 的 adapter（SDK 每次请求前都会重新挂载），
+# 而这里的请求都走 https，因此在模块加载时为共享 Session 挂载一次 https:// 的 adapter
+qn_http_client.session.mount("https://", HTTPAdapter(
+    pool_connections=_QINIU_CONNECTION_POOL_SIZE,
+    pool_maxsize=_QINIU_CONNECTION_POOL_SIZE,
+    max_retries=qiniu.config.get_default("connection_retries"),
+))
+
+# get_object 分片并发下载：分片大小与最大并发数
+_GET_OBJECT_PART_SIZE = 8 * 1024 * 1024
+_GET_OBJECT_CONCURRENCY = 8
+
+# get_object_range 默认读取的字节数
+_PREVIEW_LENGTH = 64 * 1024
+
+# 按扩展名判断文件类型：扩展名 -> 类型，一次字典查找即可完成分类
+_EXTENSION_KINDS = {
+    **dict.fromkeys((
+        "ini", "conf", "py", "js", "xml", "yml", "properties", "txt", "log",
+        "json", "yaml", "csv", "html", "css", "sh", "bash", "cfg",
+    ), "text"),
+    **dict.fromkeys(("gif", "png", "jpg", "bmp", "jpeg", "tiff", "webp", "svg"), "image"),
+    "md": "markdown",
+}
+
+
+# 私有链接签名缓存的时间粒度（秒），同一时间段内重复签名的链接直接复用
+_SIGNED_URL_CACHE_WINDOW = 60
+
+
+def _make_download_url_signer(access_key: str, secret_key: str) -> Callable[[str, int], str]:
+    """
+    构建私有下载链接签名函数，结果与 qiniu.Auth.private_download_url 一致。
+    HMAC 只用 secret key 初始化一次，每次签名复制该状态，省去重复的密钥处理。
+    """
+    keyed = hmac.new(secret_key.encode("utf-8"), digestmod=hashlib.sha1)
+    token_prefix = f"{access_key}:"
+
+    def sign(url: str, expires: int, _copy=keyed.copy, _b64=base64.urlsafe_b64encode) -> str:
+        url = f"{url}{'&' if '?' in url else '?'}e={int(time.time()) + expires}"
+        mac = _copy()
+        mac.update(url.encode("utf-8"))
+        return f"{url}&token={token_prefix}{_b64(mac.digest()).decode('ascii')}"
+
+    return sign
+
+
+@functools.lru_cache(maxsize=4096)
+def _cached_private_download_url(sign: Callable[[str, int], str], url: str, expires: int, window: int) -> str:
+    return sign(url, expires)
+
+
+def _private_download_url(sign: Callable[[str, int], str], url: str, expires: int) -> str:
+    """
+    签发私有下载链接；有效期足够长时按时间段缓存，复用的链接剩余有效期不少于 expires - 60 秒
+    """
+    if expires <= _SIGNED_URL_CACHE_WINDOW:
+        return sign(url, expires)
+    window = int(time.time() // _SIGNED_URL_CACHE_WINDOW)
+    return _cached_private_download_url(sign, url, expires, window)
+
+
+async def _fill_buffer(view: memoryview, stream, offset: int, end: int) -> int:
+    """把流的内容依次写入 view[offset:end]，返回写入结束的位置；内容超过 end 时报错"""
+    async for chunk in stream:
+        n = len(chunk)
+        if offset + n > end:
+            raise ValueError(f"Response body is longer than expected: more than {end} bytes")
+        view[offset:offset + n] = chunk
+        offset += n
+    return offset
+
+
+def _parse_content_range_size(content_range: Optional[str]) -> Optional[int]:
+    """从 "bytes 0-99/1234" 格式的 ContentRange 中解析对象总大小"""
+    if not content_range:
+        return None
+    total = content_range.rpartition("/")[2]
+    return int(total) if total.isdigit() else None
+
+# 对象内容缓存：总容量上限与单个对象的大小上限（字节）
+_OBJECT_CACHE_MAX_BYTES = 128 * 1024 * 1024
+_OBJECT_CACHE_MAX_OBJECT_SIZE = _GET_OBJECT_PART_SIZE
+
+
+class _ObjectCache:
+    """
+    按 (bucket, key) 缓存 get_object 的结果，总大小超过上限时按最近最少使用淘汰。
+    缓存项带 ETag，读取时通过 IfNoneMatch 校验对象是否变化。
+    Body 保存为 bytes 副本，调用方修改返回的 bytearray 不会影响缓存内容。
+    """
+
+    def __init__(self, max_bytes: int, max_object_size: int):
+        self.max_bytes = max_bytes
+        self.max_object_size = max_object_size
+        self._size = 0
+        self._data: "OrderedDict[tuple, Dict[str, Any]]" = OrderedDict()
+
+    def get(self, bucket: str, key: str) -> Optional[Dict[str, Any]]:
+        response = self._data.get((bucket, key))
+        if response is not None:
+            self._data.move_to_end((bucket, key))
+        return response
+
+    def put(self, bucket: str, key: str, response: Dict[str, Any]):
+        self.pop(bucket, key)
+        body = response.get("Body")
+        if not response.get("ETag") or not isinstance(body, (bytes, bytearray)) or len(body) > self.max_object_size:
+            return
+
+        self._data[(bucket, key)] = {**response, "Body": bytes(body)}
+        self._size += len(body)
+        while self._size > self.max_bytes:
+            _, evicted = self._data.popitem(last=False)
+            self._size -= len(evicted["Body"])
+
+    def pop(self, bucket: str, key: str):
+        response = self._data.pop((bucket, key), None)
+        if response is not None:
+            self._size -= len(response["Body"])
+
 
 class StorageService:
     def __init__(self, cfg: config.Config = None):
@@ -18,17 +162,59 @@ class StorageService:
             retries=dict(max_attempts=2, mode="adaptive"),
             connect_timeout=30,
             read_timeout=60,
-            max_pool_connections=50,
+            max_pool_connections=100,
+            tcp_keepalive=True,
         )
         self.config = cfg
+        # 配置的 bucket 集合，用于 O(1) 的成员判断
+        self._bucket_set = frozenset(cfg.buckets or ())
         self.s3_session = aioboto3.Session()
         self.auth = qiniu.Auth(cfg.access_key, cfg.secret_key)
+        self._sign_download_url = _make_download_url_signer(cfg.access_key, cfg.secret_key)
         self.bucket_manager = qiniu.BucketManager(self.auth, preferred_scheme="https")
+        # 共享的 S3 client，首次使用时创建，close() 时释放
+        self._s3_client = None
+        self._s3_client_lock = asyncio.Lock()
+        self._exit_stack = AsyncExitStack()
+        # 下载域名与空间私有属性很少变化，缓存后签发 URL 无需每次请求 UC
+        self._domains_cache = cache.TTLCache(ttl=_BUCKET_META_CACHE_TTL)
+        self._private_bucket_cache = cache.TTLCache(ttl=_BUCKET_META_CACHE_TTL)
+        self._buckets_cache = cache.TTLCache(ttl=_LIST_CACHE_TTL)
+        self._objects_cache = cache.TTLCache(ttl=_LIST_CACHE_TTL, maxsize=256)
+        self._object_cache = _ObjectCache(_OBJECT_CACHE_MAX_BYTES, _OBJECT_CACHE_MAX_OBJECT_SIZE)
+
+    async def _get_s3_client(self):
+        """获取共享的 S3 client，避免每次请求都重新构建 client 和连接池"""
+        if self._s3_client is None:
+            async with self._s3_client_lock:
+                if self._s3_client is None:
+                    self._s3_client = await self._exit_stack.enter_async_context(
+                        self.s3_session.client(
+                            "s3",
+                            aws_access_key_id=self.config.access_key,
+                            aws_secret_access_key=self.config.secret_key,
+                            endpoint_url=self.config.endpoint_url,
+                            region_name=self.config.region_name,
+                            config=self.s3_config,
+                        )
+                    )
+        return self._s3_client
+
+    async def preconnect(self):
+        """提前创建 S3 client"""
+        await self._get_s3_client()
+
+    async def close(self):
+        """关闭共享的 S3 client 及其连接池"""
+        self._s3_client = None
+        await self._exit_stack.aclose()
+
+    def _get_usable_domains(self, bucket: str) -> list[dict]:
+        """获取 bucket 可用（未冻结且有域名）的下载域名，结果短时间缓存"""
+        domains = self._domains_cache.get(bucket)
+        if domains is not None:
+            return domains
 
-    def get_object_url(
-            self, bucket: str, key: str, disable_ssl: bool = False, expires: int = 3600
-    ) -> list[dict[str:Any]]:
-        # 获取下载域名
         domains_getter = getattr(self.bucket_manager, "_BucketManager__uc_do_with_retrier")
         domains_list, domain_response = domains_getter('/v3/domains?tbl={0}'.format(bucket))
         if domain_response.status_code != 200:
@@ -41,75 +227,92 @@ class StorageService:
                 f"get bucket domain error：domains_list is empty reqId:{domain_response.req_id}"
             )
 
-        http_schema = "https" if not disable_ssl else "http"
-        object_public_urls = []
-        for domain in domains_list:
-            # 被冻结
-            freeze_types = domain.get("freeze_types")
-            if freeze_types is not None:
-                continue
-
-            domain_url = domain.get("domain")
-            if domain_url is None:
-                continue
-
-            object_public_urls.append({
-                "object_url": f"{http_schema}://{domain_url}/{key}",
-                "domain_type": "cdn" if domain.get("domaintype") is None or domain.get("domaintype") == 0 else "origin"
-            })
-
-        object_urls = []
+        # 过滤掉被冻结的和没有域名的
+        domains = [
+            domain for domain in domains_list
+            if domain.get("freeze_types") is None and domain.get("domain") is not None
+        ]
+        self._domains_cache.set(bucket, domains)
+        return domains
+
+    def _is_private_bucket(self, bucket: str) -> bool:
+        """bucket 是否为私有空间，结果短时间缓存"""
+        private = self._private_bucket_cache.get(bucket)
+        if private is not None:
+            return private
+
         bucket_info, bucket_info_response = self.bucket_manager.bucket_info(bucket)
-        if domain_response.status_code != 200:
+        if bucket_info_response.status_code != 200:
             raise Exception(
-                f"get bucket domain error：{bucket_info_response.exception} reqId:{bucket_info_response.req_id}"
+                f"get bucket info error：{bucket_info_response.exception} reqId:{bucket_info_response.req_id}"
             )
-        if bucket_info["private"] != 0:
-            for url_info in object_public_urls:
-                public_url = url_info.get("object_url")
-                if public_url is None:
-                    continue
-                url_info["object_url"] = self.auth.private_download_url(public_url, expires=expires)
-                object_urls.append(url_info)
-        else:
-            for url_info in object_public_urls:
-                object_urls.append(url_info)
+        private = bucket_info["private"] != 0
+        self._private_bucket_cache.set(bucket, private)
+        return private
+
+    def get_object_url(
+            self, bucket: str, key: str, disable_ssl: bool = False, expires: int = 3600
+    ) -> list[dict[str:Any]]:
+        return self.get_object_urls(bucket, [key], disable_ssl=disable_ssl, expires=expires)[key]
+
+    def get_object_urls(
+            self, bucket: str, keys: List[str], disable_ssl: bool = False, expires: int = 3600
+    ) -> Dict[str, list[dict[str:Any]]]:
+        """批量生成同一 bucket 下多个文件的访问链接，域名与私有属性只查询一次"""
+        domains_list = self._get_usable_domains(bucket)
+        private = self._is_private_bucket(bucket)
+
+        http_schema = "https" if not disable_ssl else "http"
+        domains = [
+            (
+                f"{http_schema}://{domain['domain']}/",
+                "cdn" if domain.get("domaintype") is None or domain.get("domaintype") == 0 else "origin",
+            )
+            for domain in domains_list
+        ]
+
+        object_urls = {}
+        for key in keys:
+            urls = []
+            for url_prefix, domain_type in domains:
+                object_url = url_prefix + key
+                if private:
+                    object_url = _private_download_url(self._sign_download_url, object_url, expires)
+                urls.append({
+                    "object_url": object_url,
+                    "domain_type": domain_type,
+                })
+            object_urls[key] = urls
         return object_urls
 
     async def list_buckets(self, prefix: Optional[str] = None) -> List[dict]:
-        if not self.config.buckets or len(self.config.buckets) == 0:
+        if not self._bucket_set:
             return []
 
+        buckets = self._buckets_cache.get(prefix)
+        if buckets is not None:
+            return buckets
+
         max_buckets = 50
 
-        async with self.s3_session.client(
-                "s3",
-                aws_access_key_id=self.config.access_key,
-                aws_secret_access_key=self.config.secret_key,
-                endpoint_url=self.config.endpoint_url,
-                region_name=self.config.region_name,
-        ) as s3:
-            # If buckets are configured, only return those
-            response = await s3.list_buckets()
-            all_buckets = response.get("Buckets", [])
-
-            configured_bucket_list = [
-                bucket
-                for bucket in all_buckets
-                if bucket["Name"] in self.config.buckets
-            ]
-
-            if prefix:
-                configured_bucket_list = [
-                    b for b in configured_bucket_list if b["Name"] > prefix
-                ]
-
-            return configured_bucket_list[:max_buckets]
+        s3 = await self._get_s3_client()
+        # If buckets are configured, only return those
+        response = await s3.list_buckets()
+        all_buckets = response.get("Buckets", [])
+
+        configured_buckets = (
+            bucket
+            for bucket in all_buckets
+            if bucket["Name"] in self._bucket_set and (not prefix or bucket["Name"] > prefix)
+        )
+        buckets = list(islice(configured_buckets, max_buckets))
+        self._buckets_cache.set(prefix, buckets)
+        return buckets
 
     async def list_objects(
             self, bucket: str, prefix: str = "", max_keys: int = 20, start_after: str = ""
     ) -> List[dict]:
-        if self.config.buckets and bucket not in self.config.buckets:
+        if self._bucket_set and bucket not in self._bucket_set:
             logger.warning(f"Bucket {bucket} not in configured bucket list")
             return []
 
@@ -119,47 +322,210 @@ class StorageService:
         if max_keys > 100:
             max_keys = 100
 
-        async with self.s3_session.client(
-                "s3",
-                aws_access_key_id=self.config.access_key,
-                aws_secret_access_key=self.config.secret_key,
-                endpoint_url=self.config.endpoint_url,
-                region_name=self.config.region_name,
-        ) as s3:
-            response = await s3.list_objects_v2(
-                Bucket=bucket,
-                Prefix=prefix,
-                MaxKeys=max_keys,
-                StartAfter=start_after,
+        cache_key = (bucket, prefix, max_keys, start_after)
+        objects = self._objects_cache.get(cache_key)
+        if objects is not None:
+            return objects
+
+        objects = [
+            obj async for obj in self.iter_objects(
+                bucket, prefix=prefix, limit=max_keys, start_after=start_after, page_size=max_keys
             )
-            return response.get("Contents", [])
+        ]
+        self._objects_cache.set(cache_key, objects)
+        return objects
+
+    async def iter_objects(
+            self, bucket: str, prefix: str = "", limit: Optional[int] = None, start_after: str = "",
+            page_size: int = 1000,
+    ) -> AsyncIterator[dict]:
+        """
+        逐个返回 bucket 中 start_after 之后的对象，最多 limit 个。
+        后台协程通过 list_objects_v2 分页器预取下一页，调用方处理当前页时下一页的请求已经在进行中；
+        分页器最多列举 limit 个对象，不会多请求一页。
+        """
+        if self._bucket_set and bucket not in self._bucket_set:
+            logger.warning(f"Bucket {bucket} not in configured bucket list")
+            return
+
+        if limit is not None and limit <= 0:
+            return
+
+        pagination_config = {"PageSize": page_size}
+        if limit is not None:
+            pagination_config["MaxItems"] = limit
+
+        s3 = await self._get_s3_client()
+        pages: asyncio.Queue = asyncio.Queue(maxsize=2)
+
+        async def produce():
+            # 被取消时说明调用方已不再读取，直接退出，不能再向可能已满的队列写入
+            try:
+                paginator = s3.get_paginator("list_objects_v2")
+                async for response in paginator.paginate(
+                        Bucket=bucket, Prefix=prefix, StartAfter=start_after, PaginationConfig=pagination_config
+                ):
+                    await pages.put(response.get("Contents", []))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                await pages.put(e)
+                return
+            await pages.put(None)
+
+        producer = asyncio.create_task(produce())
+        try:
+            count = 0
+            while True:
+                page = await pages.get()
+                if page is None:
+                    return
+                if isinstance(page, Exception):
+                    raise page
+                for obj in page:
+                    yield obj
+                    count += 1
+                    if limit is not None and count >= limit:
+                        return
+        finally:
+            producer.cancel()
+            await asyncio.gather(producer, return_exceptions=True)
+
+    async def stat_object(self, bucket: str, key: str) -> Dict[str, Any]:
+        """通过 HEAD 获取对象元信息（大小、类型、ETag、修改时间），不传输内容"""
+        if self._bucket_set and bucket not in self._bucket_set:
+            logger.warning(f"Bucket {bucket} not in configured bucket list")
+            return {}
+
+        s3 = await self._get_s3_client()
+        response = await s3.head_object(Bucket=bucket, Key=key)
+        return {
+            "Key": key,
+            "ContentLength": response.get("ContentLength"),
+            "ContentType": response.get("ContentType"),
+            "ETag": response.get("ETag"),
+            "LastModified": response.get("LastModified"),
+        }
+
+    async def get_object_range(
+            self, bucket: str, key: str, offset: int = 0, length: int = _PREVIEW_LENGTH
+    ) -> Dict[str, Any]:
+        """
+        读取对象的一段内容 [offset, offset + length)，用于预览，不下载完整对象。
+        返回的 ContentRange 中包含对象总大小；offset 超出对象大小时 Body 为空。
+        """
+        if self._bucket_set and bucket not in self._bucket_set:
+            logger.warning(f"Bucket {bucket} not in configured bucket list")
+            return {}
 
-    async def get_object(self, bucket: str, key: str) -> Dict[str, Any]:
-        if self.config.buckets and bucket not in self.config.buckets:
+        s3 = await self._get_s3_client()
+        try:
+            response = await s3.get_object(Bucket=bucket, Key=key, Range=f"bytes={offset}-{offset + length - 1}")
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") != "InvalidRange":
+                raise
+            return {"Body": b"", "ContentLength": 0}
+
+        response["Body"] = await self._read_body(response)
+        return response
+
+    async def get_object(
+            self, bucket: str, key: str, part_size: int = _GET_OBJECT_PART_SIZE,
+            concurrency: int = _GET_OBJECT_CONCURRENCY,
+    ) -> Dict[str, Any]:
+        if self._bucket_set and bucket not in self._bucket_set:
             logger.warning(f"Bucket {bucket} not in configured bucket list")
             return {}
 
-        async with self.s3_session.client(
-                "s3",
-                aws_access_key_id=self.config.access_key,
-                aws_secret_access_key=self.config.secret_key,
-                endpoint_url=self.config.endpoint_url,
-                region_name=self.config.region_name,
-                config=self.s3_config,
-        ) as s3:
-            # Get the object and its stream
-            response = await s3.get_object(Bucket=bucket, Key=key)
-            stream = response["Body"]
-
-            # Read the entire stream in chunks
-            chunks = []
-            async for chunk in stream:
-                chunks.append(chunk)
-
-            # Replace the stream with the complete data
-            response["Body"] = b"".join(chunks)
+        # 已缓存的对象带上 IfNoneMatch，未变化时服务端返回 304，无需再次传输内容
+        cached = self._object_cache.get(bucket, key)
+        try:
+            response = await self._download_object(
+                bucket, key, part_size, concurrency,
+                if_none_match=cached["ETag"] if cached is not None else None,
+            )
+        except ClientError as e:
+            if cached is not None and e.response.get("Error", {}).get("Code") in ("304", "NotModified"):
+                return dict(cached)
+            raise
+
+        self._object_cache.put(bucket, key, response)
+        return response
+
+    async def _download_object(
+            self, bucket: str, key: str, part_size: int, concurrency: int, if_none_match: Optional[str] = None
+    ) -> Dict[str, Any]:
+        s3 = await self._get_s3_client()
+        # 先按 Range 读取第一个分片，从 ContentRange 得到对象总大小；小对象一次请求即可完成
+        kwargs = {"Bucket": bucket, "Key": key}
+        if if_none_match:
+            kwargs["IfNoneMatch"] = if_none_match
+        try:
+            response = await s3.get_object(Range=f"bytes=0-{part_size - 1}", **kwargs)
+        except ClientError as e:
+            # 空对象不支持 Range 请求
+            if e.response.get("Error", {}).get("Code") != "InvalidRange":
+                raise
+            response = await s3.get_object(**kwargs)
+            response["Body"] = await self._read_body(response)
+            return response
+
+        size = _parse_content_range_size(response.get("ContentRange"))
+        first_part = await self._read_body(response)
+        response.pop("ContentRange", None)
+        if size is None or size <= len(first_part):
+            response["Body"] = first_part
+            response["ContentLength"] = len(first_part)
             return response
 
+        # 剩余分片并发下载，写入预分配缓冲区；IfMatch 保证各分片来自同一版本
+        buf = bytearray(size)
+        view = memoryview(buf)
+        view[:len(first_part)] = first_part
+        etag = response.get("ETag")
+        sem = asyncio.Semaphore(concurrency)
+
+        async def fetch_range(lo: int, hi: int):
+            async with sem:
+                range_kwargs = {"Bucket": bucket, "Key": key, "Range": f"bytes={lo}-{hi}"}
+                if etag:
+                    range_kwargs["IfMatch"] = etag
+                part = await s3.get_object(**range_kwargs)
+                end = await _fill_buffer(view, part["Body"], lo, hi + 1)
+                if end != hi + 1:
+                    raise ValueError(f"Incomplete range response for {bucket}/{key}: bytes {lo}-{hi}, got {end - lo} bytes")
+
+        await asyncio.gather(*(
+            fetch_range(lo, min(lo + part_size, size) - 1)
+            for lo in range(len(first_part), size, part_size)
+        ))
+        view.release()
+
+        response["Body"] = buf
+        response["ContentLength"] = size
+        return response
+
+    @staticmethod
+    async def _read_body(response: Dict[str, Any]) -> bytes | bytearray:
+        """
+        读取响应体；长度已知时直接写入预分配的 bytearray 并返回该缓冲区，
+        不保留 chunk 列表，也不再复制成 bytes，峰值内存约为对象大小。
+        """
+        stream = response["Body"]
+        content_length = response.get("ContentLength")
+        if content_length is None:
+            return await stream.read()
+
+        buf = bytearray(content_length)
+        view = memoryview(buf)
+        try:
+            offset = await _fill_buffer(view, stream, 0, content_length)
+        finally:
+            view.release()
+        if offset != content_length:
+            del buf[offset:]
+        return buf
+
     def upload_text_data(self, bucket: str, key: str, data: str, overwrite: bool = False) -> list[dict[str:Any]]:
         policy = {
             "insertOnly": 1,
@@ -174,6 +540,7 @@ class StorageService:
         if info.status_code != 200:
             raise Exception(f"Failed to upload object: {info}")
 
+        self._objects_cache.clear()
         return self.get_object_url(bucket, key)
 
     def upload_local_file(self, bucket: str, key: str, file_path: str, overwrite: bool = False) -> list[dict[str:Any]]:
@@ -190,6 +557,7 @@ class StorageService:
         if info.status_code != 200:
             raise Exception(f"Failed to upload object: {info}")
 
+        self._objects_cache.clear()
         return self.get_object_url(bucket, key)
 
     def fetch_object(self, bucket: str, key: str, url: str):
@@ -197,49 +565,22 @@ class StorageService:
         if info.status_code != 200:
             raise Exception(f"Failed to fetch object: {info}")
 
+        self._objects_cache.clear()
         return self.get_object_url(bucket, key)
 
     def is_text_file(self, key: str) -> bool:
-        text_extensions = {
-            ".ini",
-            ".conf",
-            ".py",
-            ".js",
-            ".xml",
-            ".yml",
-            ".properties",
-            ".txt",
-            ".log",
-            ".json",
-            ".yaml",
-            ".md",
-            ".csv",
-            ".html",
-            ".css",
-            ".sh",
-            ".bash",
-            ".cfg",
-        }
-        return any(key.lower().endswith(ext) for ext in text_extensions)
-
+        # markdown 也是文本文件
+        return self.classify(key) in ("text", "markdown")
 
     def is_image_file(self, key: str) -> bool:
-        """Determine if a file is text-based by its extension"""
-        text_extensions = {
-            ".gif",
-            ".png",
-            ".jpg",
-            ".bmp",
-            ".jpeg",
-            ".tiff",
-            ".webp",
-            ".svg",
-        }
-        return any(key.lower().endswith(ext) for ext in text_extensions)
-
+        return self.classify(key) == "image"
 
     def is_markdown_file(self, key: str) -> bool:
-        text_extensions = {
-            ".md",
-        }
-        return any(key.lower().endswith(ext) for ext in text_extensions)
+        return self.classify(key) == "markdown"
+
+    def classify(self, key: str) -> str:
+        """按扩展名判断文件类型，返回 markdown、image、text 或 binary"""
+        _, dot, extension = key.rpartition(".")
+        if not dot:
+            return "binary"
+        return _EXTENSION_KINDS.get(extension.lower(), "binary")
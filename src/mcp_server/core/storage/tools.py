@@ -1,236 +1,353 @@
+import functools
 import logging
-import base64
 
 from mcp import types
-from mcp.types import ImageContent, TextContent
+from mcp.types import EmbeddedResource, ImageContent, TextContent
 
 from .storage import StorageService
 from ...consts import consts
 from ...tools import tools
 
+# pybase64 is optional and, when installed, encodes with SIMD several times faster.
+try:
+    import pybase64 as base64
+except ImportError:
+    import base64
+
 logger = logging.getLogger(consts.LOGGER_NAME)
 
 _BUCKET_DESC = "Qiniu Cloud Storage bucket Name"
 
+_IMAGE_MIME_PREFIX = "image/"
+_TEXT_MIME_PREFIXES = ("text/", "application/json", "application/xml", "application/javascript")
+# 判断是否为二进制内容时检查的开头字节数
+_BINARY_SNIFF_SIZE = 8000
+
+
+@functools.lru_cache(maxsize=1024)
+def _kind_of(content_type: str) -> str:
+    """按 Content-Type 判断内容类型，返回 image、text 或 unknown"""
+    mime_type = content_type.split(";", 1)[0].strip().lower()
+    if mime_type.startswith(_IMAGE_MIME_PREFIX):
+        return "image"
+    if mime_type.startswith(_TEXT_MIME_PREFIXES):
+        return "text"
+    return "unknown"
+
+
+# Input schema properties shared by several tools
+_BUCKET_PROP = {"type": "string", "description": _BUCKET_DESC}
+_OBJECT_KEY_PROP = {"type": "string", "description": "Key of the object to get."}
+_UPLOAD_KEY_PROP = {
+    "type": "string",
+    "description": "The key under which a file is saved in Qiniu Cloud Storage serves as the unique identifier for the file within that space, typically using the filename.",
+}
+_OVERWRITE_PROP = {
+    "type": "boolean",
+    "description": "Whether to overwrite the existing object if it already exists.",
+}
+_DISABLE_SSL_PROP = {
+    "type": "boolean",
+    "description": "Whether to disable SSL. By default, it is not disabled (HTTP protocol is used). If disabled, the HTTP protocol will be used.",
+}
+_EXPIRES_PROP = {
+    "type": "integer",
+    "description": "Token expiration time (in seconds) for download links. When the bucket is private, a signed Token is required to access file objects. Public buckets do not require Token signing.",
+}
+
+
+_LIST_BUCKETS_TOOL = types.Tool(
+    name="list_buckets",
+    description="Return the Bucket you configured based on the conditions.",
+    inputSchema={
+        "type": "object",
+        "properties": {
+            "prefix": {
+                "type": "string",
+                "description": "Bucket prefix. The listed Buckets will be filtered based on this prefix, and only those matching the prefix will be output.",
+            },
+        },
+        "required": [],
+    },
+)
+
+
+_LIST_OBJECTS_TOOL = types.Tool(
+    name="list_objects",
+    description="List objects in Qiniu Cloud, list a part each time, you can set start_after to continue listing, when the number of listed objects is less than max_keys, it means that all files are listed. start_after can be the key of the last file in the previous listing.",
+    inputSchema={
+        "type": "object",
+        "properties": {
+            "bucket": _BUCKET_PROP,
+            "max_keys": {
+                "type": "integer",
+                "description": "Sets the max number of keys returned, default: 20",
+            },
+            "prefix": {
+                "type": "string",
+                "description": "Specify the prefix of the operation response key. Only keys that meet this prefix will be listed.",
+            },
+            "start_after": {
+                "type": "string",
+                "description": "start_after is where you want Qiniu Cloud to start listing from. Qiniu Cloud starts listing after this specified key. start_after can be any key in the bucket.",
+            },
+        },
+        "required": ["bucket"],
+    },
+)
+
+
+_GET_OBJECT_TOOL = types.Tool(
+    name="get_object",
+    description="Get an object contents from Qiniu Cloud bucket. In the GetObject request, specify the full key name for the object.",
+    inputSchema={
+        "type": "object",
+        "properties": {
+            "bucket": _BUCKET_PROP,
+            "key": _OBJECT_KEY_PROP,
+        },
+        "required": ["bucket", "key"],
+    },
+)
+
+
+_GET_OBJECT_PREVIEW_TOOL = types.Tool(
+    name="get_object_preview",
+    description="Get part of an object's contents from Qiniu Cloud bucket without downloading the whole object, e.g. to identify a file, read a CSV header or peek at a log. Images are returned as binary data in this tool; use get_object to view them.",
+    inputSchema={
+        "type": "object",
+        "properties": {
+            "bucket": _BUCKET_PROP,
+            "key": _OBJECT_KEY_PROP,
+            "offset": {
+                "type": "integer",
+                "minimum": 0,
+                "description": "Byte offset to start reading from, default: 0",
+            },
+            "length": {
+                "type": "integer",
+                "minimum": 1,
+                "description": "Number of bytes to read, default: 65536",
+            },
+        },
+        "required": ["bucket", "key"],
+    },
+)
+
+
+_STAT_OBJECT_TOOL = types.Tool(
+    name="stat_object",
+    description="Get the metadata (size, content type, ETag, last modified time) of an object in Qiniu Cloud Storage without downloading its content.",
+    inputSchema={
+        "type": "object",
+        "properties": {
+            "bucket": _BUCKET_PROP,
+            "key": {
+                "type": "string",
+                "description": "Key of the object to stat.",
+            },
+        },
+        "required": ["bucket", "key"],
+    },
+)
+
+
+_UPLOAD_TEXT_DATA_TOOL = types.Tool(
+    name="upload_text_data",
+    description="Upload text data to Qiniu bucket.",
+    inputSchema={
+        "type": "object",
+        "properties": {
+            "bucket": _BUCKET_PROP,
+            "key": _UPLOAD_KEY_PROP,
+            "data": {
+                "type": "string",
+                "description": "The data to upload.",
+            },
+            "overwrite": _OVERWRITE_PROP,
+        },
+        "required": ["bucket", "key", "data"],
+    },
+)
+
+
+_UPLOAD_LOCAL_FILE_TOOL = types.Tool(
+    name="upload_local_file",
+    description="Upload a local file to Qiniu bucket.",
+    inputSchema={
+        "type": "object",
+        "properties": {
+            "bucket": _BUCKET_PROP,
+            "key": _UPLOAD_KEY_PROP,
+            "file_path": {
+                "type": "string",
+                "description": "The file path of file to upload.",
+            },
+            "overwrite": _OVERWRITE_PROP,
+        },
+        "required": ["bucket", "key", "file_path"],
+    },
+)
+
+
+_FETCH_OBJECT_TOOL = types.Tool(
+    name="fetch_object",
+    description="Fetch a http object to Qiniu bucket.",
+    inputSchema={
+        "type": "object",
+        "properties": {
+            "bucket": _BUCKET_PROP,
+            "key": _UPLOAD_KEY_PROP,
+            "url": {
+                "type": "string",
+                "description": "The URL of the object to fetch.",
+            },
+        },
+        "required": ["bucket", "key", "url"],
+    },
+)
+
+
+_GET_OBJECT_URL_TOOL = types.Tool(
+    name="get_object_url",
+    description="Get the file download URL, and note that the Bucket where the file is located must be bound to a domain name. If using Qiniu Cloud test domain, HTTPS access will not be available, and users need to make adjustments for this themselves.",
+    inputSchema={
+        "type": "object",
+        "properties": {
+            "bucket": _BUCKET_PROP,
+            "key": _OBJECT_KEY_PROP,
+            "disable_ssl": _DISABLE_SSL_PROP,
+            "expires": _EXPIRES_PROP,
+        },
+        "required": ["bucket", "key"],
+    },
+)
+
+
+_GET_OBJECT_URLS_TOOL = types.Tool(
+    name="get_object_urls",
+    description="Get the download URLs of multiple files in the same bucket in one call. The bucket must be bound to a domain name; see get_object_url.",
+    inputSchema={
+        "type": "object",
+        "properties": {
+            "bucket": _BUCKET_PROP,
+            "keys": {
+                "type": "array",
+                "items": {"type": "string"},
+                "description": "Keys of the objects to get.",
+            },
+            "disable_ssl": _DISABLE_SSL_PROP,
+            "expires": _EXPIRES_PROP,
+        },
+        "required": ["bucket", "keys"],
+    },
+)
+
+
+def _text_or_blob(bucket: str, key: str, file_content: bytes | bytearray, content_type: str, kind: str) -> list:
+    # 未标明类型的文件（如 application/octet-stream）开头没有 NUL 字节时视为文本
+    if kind == "text" or file_content.find(b"\0", 0, _BINARY_SNIFF_SIZE) == -1:
+        text_content = file_content.decode("utf-8", errors="replace")
+        return [types.TextContent(type="text", text=text_content)]
+
+    # 其他二进制内容作为 blob 资源返回
+    return [
+        types.EmbeddedResource(
+            type="resource",
+            resource=types.BlobResourceContents(
+                uri=f"s3://{bucket}/{key}",
+                mimeType=content_type,
+                blob=base64.b64encode(file_content).decode("ascii"),
+            ),
+        )
+    ]
+
+
+def _bucket_not_configured(bucket: str) -> list[TextContent]:
+    # 服务对未配置的 bucket 返回空结果，这里给出说明，而不是读取 Body 时报 KeyError
+    return [types.TextContent(type="text", text=f"Bucket {bucket} is not in the configured bucket list")]
+
+
 class _ToolImpl:
     def __init__(self, storage: StorageService):
         self.storage = storage
 
-    @tools.tool_meta(
-        types.Tool(
-            name="list_buckets",
-            description="Return the Bucket you configured based on the conditions.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "prefix": {
-                        "type": "string",
-                        "description": "Bucket prefix. The listed Buckets will be filtered based on this prefix, and only those matching the prefix will be output.",
-                    },
-                },
-                "required": [],
-            },
-        )
-    )
+    @tools.tool_meta(_LIST_BUCKETS_TOOL)
     async def list_buckets(self, **kwargs) -> list[types.TextContent]:
         buckets = await self.storage.list_buckets(**kwargs)
-        return [types.TextContent(type="text", text=str(buckets))]
-
-    @tools.tool_meta(
-        types.Tool(
-            name="list_objects",
-            description="List objects in Qiniu Cloud, list a part each time, you can set start_after to continue listing, when the number of listed objects is less than max_keys, it means that all files are listed. start_after can be the key of the last file in the previous listing.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "bucket": {
-                        "type": "string",
-                        "description": _BUCKET_DESC,
-                    },
-                    "max_keys": {
-                        "type": "integer",
-                        "description": "Sets the max number of keys returned, default: 20",
-                    },
-                    "prefix": {
-                        "type": "string",
-                        "description": "Specify the prefix of the operation response key. Only keys that meet this prefix will be listed.",
-                    },
-                    "start_after": {
-                        "type": "string",
-                        "description": "start_after is where you want Qiniu Cloud to start listing from. Qiniu Cloud starts listing after this specified key. start_after can be any key in the bucket.",
-                    },
-                },
-                "required": ["bucket"],
-            },
-        )
-    )
+        return [types.TextContent(type="text", text=tools.dumps(buckets))]
+
+    @tools.tool_meta(_LIST_OBJECTS_TOOL)
     async def list_objects(self, **kwargs) -> list[types.TextContent]:
         objects = await self.storage.list_objects(**kwargs)
-        return [types.TextContent(type="text", text=str(objects))]
-
-    @tools.tool_meta(
-        types.Tool(
-            name="get_object",
-            description="Get an object contents from Qiniu Cloud bucket. In the GetObject request, specify the full key name for the object.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "bucket": {
-                        "type": "string",
-                        "description": _BUCKET_DESC,
-                    },
-                    "key": {
-                        "type": "string",
-                        "description": "Key of the object to get.",
-                    },
-                },
-                "required": ["bucket", "key"],
-            },
-        )
-    )
-    async def get_object(self, **kwargs) -> list[ImageContent] | list[TextContent]:
+        return [types.TextContent(type="text", text=tools.dumps(objects))]
+
+    @tools.tool_meta(_GET_OBJECT_TOOL)
+    async def get_object(self, **kwargs) -> list[ImageContent] | list[TextContent] | list[EmbeddedResource]:
         response = await self.storage.get_object(**kwargs)
+        if not response:
+            return _bucket_not_configured(kwargs["bucket"])
         file_content = response["Body"]
         content_type = response.get("ContentType", "application/octet-stream")
+        kind = _kind_of(content_type)
 
         # 根据内容类型返回不同的响应
-        if content_type.startswith("image/"):
-            base64_data = base64.b64encode(file_content).decode("utf-8")
+        if kind == "image":
+            base64_data = base64.b64encode(file_content).decode("ascii")
             return [
                 types.ImageContent(
                     type="image", data=base64_data, mimeType=content_type
                 )
             ]
 
-        if isinstance(file_content, bytes):
-            text_content = file_content.decode("utf-8")
-        else:
-            text_content = str(file_content)
-        return [types.TextContent(type="text", text=text_content)]
+        return _text_or_blob(kwargs["bucket"], kwargs["key"], file_content, content_type, kind)
 
-    @tools.tool_meta(
-        types.Tool(
-            name="upload_text_data",
-            description="Upload text data to Qiniu bucket.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "bucket": {
-                        "type": "string",
-                        "description": _BUCKET_DESC,
-                    },
-                    "key": {
-                        "type": "string",
-                        "description": "The key under which a file is saved in Qiniu Cloud Storage serves as the unique identifier for the file within that space, typically using the filename.",
-                    },
-                    "data": {
-                        "type": "string",
-                        "description": "The data to upload.",
-                    },
-                    "overwrite": {
-                        "type": "boolean",
-                        "description": "Whether to overwrite the existing object if it already exists.",
-                    },
-                },
-                "required": ["bucket", "key", "data"],
-            }
-        )
-    )
+    @tools.tool_meta(_GET_OBJECT_PREVIEW_TOOL)
+    async def get_object_preview(self, **kwargs) -> list[TextContent] | list[EmbeddedResource]:
+        response = await self.storage.get_object_range(**kwargs)
+        if not response:
+            return _bucket_not_configured(kwargs["bucket"])
+        file_content = response["Body"]
+        content_type = response.get("ContentType", "application/octet-stream")
+
+        # 片段可能是不完整的图片，因此只按文本或二进制返回
+        contents = _text_or_blob(kwargs["bucket"], kwargs["key"], file_content, content_type, _kind_of(content_type))
+        contents.append(types.TextContent(type="text", text=tools.dumps({
+            "content_range": response.get("ContentRange"),
+            "content_type": content_type,
+            "length": len(file_content),
+        })))
+        return contents
+
+    @tools.tool_meta(_STAT_OBJECT_TOOL)
+    async def stat_object(self, **kwargs) -> list[types.TextContent]:
+        stat = await self.storage.stat_object(**kwargs)
+        return [types.TextContent(type="text", text=tools.dumps(stat))]
+
+    @tools.tool_meta(_UPLOAD_TEXT_DATA_TOOL)
     def upload_text_data(self, **kwargs) -> list[types.TextContent]:
         urls = self.storage.upload_text_data(**kwargs)
-        return [types.TextContent(type="text", text=str(urls))]
-
-    @tools.tool_meta(
-        types.Tool(
-            name="upload_local_file",
-            description="Upload a local file to Qiniu bucket.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "bucket": {
-                        "type": "string",
-                        "description": _BUCKET_DESC,
-                    },
-                    "key": {
-                        "type": "string",
-                        "description": "The key under which a file is saved in Qiniu Cloud Storage serves as the unique identifier for the file within that space, typically using the filename.",
-                    },
-                    "file_path": {
-                        "type": "string",
-                        "description": "The file path of file to upload.",
-                    },
-                    "overwrite": {
-                        "type": "boolean",
-                        "description": "Whether to overwrite the existing object if it already exists.",
-                    },
-                },
-                "required": ["bucket", "key", "file_path"],
-            }
-        )
-    )
+        return [types.TextContent(type="text", text=tools.dumps(urls))]
+
+    @tools.tool_meta(_UPLOAD_LOCAL_FILE_TOOL)
     def upload_local_file(self, **kwargs) -> list[types.TextContent]:
         urls = self.storage.upload_local_file(**kwargs)
-        return [types.TextContent(type="text", text=str(urls))]
-
-    @tools.tool_meta(
-        types.Tool(
-            name="fetch_object",
-            description="Fetch a http object to Qiniu bucket.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "bucket": {
-                        "type": "string",
-                        "description": _BUCKET_DESC,
-                    },
-                    "key": {
-                        "type": "string",
-                        "description": "The key under which a file is saved in Qiniu Cloud Storage serves as the unique identifier for the file within that space, typically using the filename.",
-                    },
-                    "url": {
-                        "type": "string",
-                        "description": "The URL of the object to fetch.",
-                    },
-                },
-                "required": ["bucket", "key", "url"],
-            }
-        )
-    )
+        return [types.TextContent(type="text", text=tools.dumps(urls))]
+
+    @tools.tool_meta(_FETCH_OBJECT_TOOL)
     def fetch_object(self, **kwargs) -> list[types.TextContent]:
         urls = self.storage.fetch_object(**kwargs)
-        return [types.TextContent(type="text", text=str(urls))]
-
-    @tools.tool_meta(
-        types.Tool(
-            name="get_object_url",
-            description="Get the file download URL, and note that the Bucket where the file is located must be bound to a domain name. If using Qiniu Cloud test domain, HTTPS access will not be available, and users need to make adjustments for this themselves.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "bucket": {
-                        "type": "string",
-                        "description": _BUCKET_DESC,
-                    },
-                    "key": {
-                        "type": "string",
-                        "description": "Key of the object to get.",
-                    },
-                    "disable_ssl": {
-                        "type": "boolean",
-                        "description": "Whether to disable SSL. By default, it is not disabled (HTTP protocol is used). If disabled, the HTTP protocol will be used.",
-                    },
-                    "expires": {
-                        "type": "integer",
-                        "description": "Token expiration time (in seconds) for download links. When the bucket is private, a signed Token is required to access file objects. Public buckets do not require Token signing.",
-                    },
-                },
-                "required": ["bucket", "key"],
-            },
-        )
-    )
+        return [types.TextContent(type="text", text=tools.dumps(urls))]
+
+    @tools.tool_meta(_GET_OBJECT_URL_TOOL)
     def get_object_url(self, **kwargs) -> list[types.TextContent]:
         urls = self.storage.get_object_url(**kwargs)
-        return [types.TextContent(type="text", text=str(urls))]
+        return [types.TextContent(type="text", text=tools.dumps(urls))]
+
+    @tools.tool_meta(_GET_OBJECT_URLS_TOOL)
+    def get_object_urls(self, **kwargs) -> list[types.TextContent]:
+        urls = self.storage.get_object_urls(**kwargs)
+        return [types.TextContent(type="text", text=tools.dumps(urls))]
 
 
 def register_tools(storage: StorageService):
@@ -240,8 +357,11 @@ def register_tools(storage: StorageService):
             tool_impl.list_buckets,
             tool_impl.list_objects,
             tool_impl.get_object,
+            tool_impl.get_object_preview,
+            tool_impl.stat_object,
             tool_impl.upload_text_data,
             tool_impl.upload_local_file,
             tool_impl.get_object_url,
+            tool_impl.get_object_urls,
         ]
     )
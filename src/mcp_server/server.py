@@ -4,7 +4,7 @@ import logging
 import anyio
 import click
 
-from . import application
+from . import application, core
 from .consts import consts
 
 logger = logging.getLogger(consts.LOGGER_NAME)
@@ -17,6 +17,26 @@ SAMPLE_RESOURCES = {
 }
 
 
+def _asyncio_backend_options() -> dict:
+    """uvloop 为可选依赖，安装了就用它作为事件循环"""
+    try:
+        import uvloop  # noqa: F401
+    except ImportError:
+        return {}
+    return {"use_uvloop": True}
+
+
+# 持有预连接任务的引用，避免任务在完成前被回收
+_background_tasks = set()
+
+
+def _start_preconnect():
+    """在后台预先建立连接，不阻塞服务启动"""
+    task = asyncio.get_running_loop().create_task(core.preconnect())
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+
+
 @click.command()
 @click.option("--port", default=8000, help="Port to listen on for SSE")
 @click.option(
@@ -49,21 +69,29 @@ def main(port: int, transport: str) -> int:
                 Route("/sse", endpoint=handle_sse),
                 Mount("/messages/", app=sse.handle_post_message),
             ],
+            on_startup=[_start_preconnect],
+            on_shutdown=[core.close],
         )
 
         import uvicorn
 
+        # loop="auto"（默认）在安装了 uvloop 时会自动使用它
         uvicorn.run(starlette_app, host="0.0.0.0", port=port)
     else:
         from mcp.server.stdio import stdio_server
 
         async def arun():
-            async with stdio_server() as streams:
-                await app.run(
-                    streams[0], streams[1], app.create_initialization_options()
-                )
-
-        anyio.run(arun)
+            try:
+                async with anyio.create_task_group() as tg:
+                    tg.start_soon(core.preconnect)
+                    async with stdio_server() as streams:
+                        await app.run(
+                            streams[0], streams[1], app.create_initialization_options()
+                        )
+            finally:
+                await core.close()
+
+        anyio.run(arun, backend_options=_asyncio_backend_options())
 
     return 0
 
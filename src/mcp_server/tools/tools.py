@@ -1,6 +1,8 @@
 import functools
 import inspect
 import asyncio
+import datetime
+import json
 import logging
 import fastjsonschema
 
@@ -25,6 +27,23 @@ class _ToolEntry:
     input_validator: Optional[Callable[..., None]]
 
 
+def _json_default(value):
+    # 与 orjson 保持一致：datetime / date 输出 ISO 8601，其余无法序列化的值按 str() 输出
+    if isinstance(value, (datetime.datetime, datetime.date)):
+        return value.isoformat()
+    return str(value)
+
+
+# 工具结果序列化为紧凑 JSON；安装了 orjson 时优先使用，否则复用预先构建的 JSONEncoder
+try:
+    import orjson
+
+    def dumps(result) -> str:
+        return orjson.dumps(result, default=str, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+except ImportError:
+    dumps = json.JSONEncoder(separators=(",", ":"), ensure_ascii=False, default=_json_default).encode
+
+
 # 初始化全局工具字典
 _all_tools: Dict[str, _ToolEntry] = {}
 
@@ -137,4 +156,5 @@ __all__ = [
     "call_tool",
     "tool_meta",
     "auto_register_tools",
+    "dumps",
 ]
@@ -0,0 +1,37 @@
+import asyncio
+
+from mcp_server import core
+from mcp_server.config import config
+from mcp_server.core import live_streaming
+from mcp_server.core.live_streaming import tools as live_streaming_tools
+
+
+def test_reload_rebinds_service_and_closes_replaced_on_serving_loop():
+    cfg = config.load_config()
+    changed = config.load_config()
+    changed.live_endpoint = "changed.example.com"
+
+    async def run():
+        first = live_streaming.load(cfg)
+        core._track("live_streaming", first)
+        session = await first._get_session()
+
+        # 配置不变时沿用已绑定的服务
+        assert live_streaming.load(config.load_config()) is first
+
+        second = live_streaming.load(changed)
+        core._track("live_streaming", second)
+        assert second is not first
+        assert live_streaming_tools._tool_impl.live_streaming is second
+        # 被替换的服务在 close() 之前保持打开
+        assert not session.closed
+
+        await core.close()
+        return session
+
+    try:
+        session = asyncio.run(run())
+        assert session.closed
+        assert core._replaced_services == []
+    finally:
+        core._closeable_services.pop("live_streaming", None)
@@ -0,0 +1,77 @@
+import asyncio
+
+from botocore.exceptions import ClientError
+
+from mcp_server.config import config
+from mcp_server.core.storage.storage import StorageService
+from mcp_server.core.storage.tools import _ToolImpl
+
+
+class _FakeStream:
+    def __init__(self, data: bytes):
+        self.data = data
+
+    async def __aiter__(self):
+        yield self.data
+
+
+class _FakeS3:
+    def __init__(self, data: bytes):
+        self.data = data
+        self.calls = []
+
+    async def get_object(self, Bucket, Key, Range=None, **kwargs):
+        self.calls.append(Range)
+        first, _, last = Range[len("bytes="):].partition("-")
+        first, last = int(first), min(int(last), len(self.data) - 1)
+        if first >= len(self.data):
+            raise ClientError({"Error": {"Code": "InvalidRange"}}, "GetObject")
+        body = self.data[first:last + 1]
+        return {
+            "Body": _FakeStream(body),
+            "ContentLength": len(body),
+            "ContentRange": f"bytes {first}-{last}/{len(self.data)}",
+            "ContentType": "text/plain",
+        }
+
+
+def _storage(s3: _FakeS3, buckets=()) -> StorageService:
+    cfg = config.load_config()
+    cfg.buckets = list(buckets)
+    storage = StorageService(cfg)
+
+    async def get_s3_client():
+        return s3
+
+    storage._get_s3_client = get_s3_client
+    return storage
+
+
+def test_get_object_range_requests_only_the_range():
+    s3 = _FakeS3(b"0123456789")
+    storage = _storage(s3)
+
+    response = asyncio.run(storage.get_object_range("bucket", "key", offset=2, length=4))
+    assert s3.calls == ["bytes=2-5"]
+    assert bytes(response["Body"]) == b"2345"
+    assert response["ContentRange"] == "bytes 2-5/10"
+
+
+def test_get_object_range_past_end_returns_empty_body():
+    s3 = _FakeS3(b"0123456789")
+    storage = _storage(s3)
+
+    response = asyncio.run(storage.get_object_range("bucket", "key", offset=10, length=4))
+    assert s3.calls == ["bytes=10-13"]
+    assert response["Body"] == b""
+
+
+def test_get_object_preview_for_unconfigured_bucket():
+    s3 = _FakeS3(b"0123456789")
+    tool = _ToolImpl(_storage(s3, buckets=["allowed"]))
+
+    contents = asyncio.run(tool.get_object_preview(bucket="other", key="key"))
+    assert s3.calls == []
+    assert len(contents) == 1
+    assert "other" in contents[0].text
+    assert "not in the configured bucket list" in contents[0].text
@@ -0,0 +1,100 @@
+import asyncio
+import contextlib
+
+from mcp_server.config import config
+from mcp_server.core.storage.storage import StorageService
+
+
+class _FakePaginator:
+    def __init__(self, s3):
+        self.s3 = s3
+
+    async def paginate(self, Bucket, Prefix, PaginationConfig, StartAfter="", **kwargs):
+        page_size = PaginationConfig["PageSize"]
+        keys = [k for k in self.s3.keys if k.startswith(Prefix) and k > StartAfter]
+        keys = keys[:PaginationConfig.get("MaxItems", len(keys))]
+        for start in range(0, len(keys), page_size):
+            self.s3.pages_fetched += 1
+            yield {"Contents": [{"Key": k} for k in keys[start:start + page_size]]}
+        self.s3.exhausted = True
+
+
+class _FakeS3:
+    def __init__(self, count: int):
+        self.keys = [f"key-{i:05d}" for i in range(count)]
+        self.pages_fetched = 0
+        self.exhausted = False
+
+    def get_paginator(self, name):
+        assert name == "list_objects_v2"
+        return _FakePaginator(self)
+
+
+def _storage(s3: _FakeS3) -> StorageService:
+    cfg = config.load_config()
+    cfg.buckets = []
+    storage = StorageService(cfg)
+
+    async def get_s3_client():
+        return s3
+
+    storage._get_s3_client = get_s3_client
+    return storage
+
+
+def test_iter_objects_returns_all_objects():
+    s3 = _FakeS3(2500)
+    storage = _storage(s3)
+
+    async def run():
+        return [obj["Key"] async for obj in storage.iter_objects("bucket", page_size=1000)]
+
+    assert asyncio.run(run()) == s3.keys
+    assert s3.exhausted
+
+
+def test_iter_objects_stops_early_with_full_queue():
+    s3 = _FakeS3(100)
+    storage = _storage(s3)
+
+    async def run():
+        keys = []
+        async with contextlib.aclosing(storage.iter_objects("bucket", page_size=2)) as objects:
+            async for obj in objects:
+                keys.append(obj["Key"])
+                # 让后台协程把队列填满并阻塞在下一次写入上
+                await asyncio.sleep(0.01)
+                if len(keys) == 3:
+                    break
+        others = [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+        return keys, others
+
+    keys, others = asyncio.run(run())
+    assert keys == s3.keys[:3]
+    # 提前结束后不能留下仍在运行的预取协程
+    assert others == []
+    assert not s3.exhausted
+
+
+def test_iter_objects_limit_bounds_pagination():
+    s3 = _FakeS3(100)
+    storage = _storage(s3)
+
+    async def run():
+        return [obj["Key"] async for obj in storage.iter_objects("bucket", limit=3, page_size=2)]
+
+    assert asyncio.run(run()) == s3.keys[:3]
+    assert s3.pages_fetched == 2
+
+
+def test_list_objects_fetches_one_page_after_start_after():
+    s3 = _FakeS3(100)
+    storage = _storage(s3)
+
+    objects = asyncio.run(storage.list_objects("bucket", max_keys=20, start_after=s3.keys[9]))
+    assert [obj["Key"] for obj in objects] == s3.keys[10:30]
+    assert s3.pages_fetched == 1
+
+    # 相同参数命中缓存，不再请求
+    asyncio.run(storage.list_objects("bucket", max_keys=20, start_after=s3.keys[9]))
+    assert s3.pages_fetched == 1
@@ -0,0 +1,83 @@
+import asyncio
+
+from botocore.exceptions import ClientError
+
+from mcp_server.config import config
+from mcp_server.core.storage.storage import StorageService, _ObjectCache
+
+
+class _FakeStream:
+    def __init__(self, data: bytes):
+        self.data = data
+
+    async def __aiter__(self):
+        yield self.data
+
+
+class _FakeS3:
+    def __init__(self, data: bytes, etag: str = '"v1"'):
+        self.data = data
+        self.etag = etag
+        self.if_none_match = []
+
+    async def get_object(self, Bucket, Key, Range=None, IfNoneMatch=None, **kwargs):
+        self.if_none_match.append(IfNoneMatch)
+        if IfNoneMatch == self.etag:
+            raise ClientError({"Error": {"Code": "304"}}, "GetObject")
+        return {
+            "Body": _FakeStream(self.data),
+            "ContentLength": len(self.data),
+            "ContentRange": f"bytes 0-{len(self.data) - 1}/{len(self.data)}",
+            "ContentType": "text/plain",
+            "ETag": self.etag,
+        }
+
+
+def _storage(s3: _FakeS3) -> StorageService:
+    cfg = config.load_config()
+    cfg.buckets = []
+    storage = StorageService(cfg)
+
+    async def get_s3_client():
+        return s3
+
+    storage._get_s3_client = get_s3_client
+    return storage
+
+
+def test_get_object_revalidates_cached_object():
+    s3 = _FakeS3(b"hello")
+    storage = _storage(s3)
+
+    first = asyncio.run(storage.get_object("bucket", "key"))
+    # 修改返回的缓冲区不能影响缓存内容
+    first["Body"][:] = b"xxxxx"
+
+    second = asyncio.run(storage.get_object("bucket", "key"))
+    assert s3.if_none_match == [None, '"v1"']
+    assert second["Body"] == b"hello"
+
+    # 对象变化后重新下载并更新缓存
+    s3.data, s3.etag = b"world", '"v2"'
+    third = asyncio.run(storage.get_object("bucket", "key"))
+    assert s3.if_none_match[-1] == '"v1"'
+    assert third["Body"] == b"world"
+
+
+def test_object_cache_evicts_least_recently_used_by_size():
+    cache = _ObjectCache(max_bytes=10, max_object_size=8)
+    cache.put("bucket", "a", {"Body": b"aaaa", "ETag": "a"})
+    cache.put("bucket", "b", {"Body": b"bbbb", "ETag": "b"})
+    # 访问 a 后 b 成为最久未使用的对象
+    assert cache.get("bucket", "a") is not None
+    cache.put("bucket", "c", {"Body": b"cccc", "ETag": "c"})
+
+    assert cache.get("bucket", "b") is None
+    assert cache.get("bucket", "a")["Body"] == b"aaaa"
+    assert cache.get("bucket", "c")["Body"] == b"cccc"
+
+    # 超过单个对象上限或没有 ETag 的结果不缓存
+    cache.put("bucket", "d", {"Body": b"d" * 9, "ETag": "d"})
+    cache.put("bucket", "e", {"Body": b"e"})
+    assert cache.get("bucket", "d") is None
+    assert cache.get("bucket", "e") is None